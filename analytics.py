@@ -0,0 +1,200 @@
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+
+import profiler
+
+logger = logging.getLogger(__name__)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+ANALYTICS_PATH = os.getenv("ANALYTICS_PATH", os.path.join(CACHE_DIR, "analytics.sqlite3"))
+
+# Buffered events are written every FLUSH_SECONDS, or as soon as BATCH_SIZE are waiting
+FLUSH_SECONDS = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "5"))
+BATCH_SIZE = 200
+# If the disk falls behind, the oldest buffered events are dropped (and counted)
+MAX_BUFFER = int(os.getenv("ANALYTICS_MAX_BUFFER", "10000"))
+QUESTION_CHARS = 300
+
+
+def _day(ts):
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+
+def _question_key(question):
+    text = unicodedata.normalize("NFKC", question).lower()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+# Usage events (page views, chat questions, contact submissions). track() only appends to
+# an in-memory buffer; a background thread writes batches to SQLite and, in the same
+# transaction, bumps the aggregate tables the dashboard reads (never the event log).
+class Analytics:
+    def __init__(self, path, flush_seconds=FLUSH_SECONDS, max_buffer=MAX_BUFFER):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._buffer = deque(maxlen=max_buffer)
+        self._conn = None
+        self._worker = None
+        self._stats = {"tracked": 0, "flushed": 0, "dropped": 0, "flushes": 0, "last_flush_ms": None}
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Append-only log; key is the page, the answer source or the inquiry category
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, kind TEXT, session TEXT, key TEXT, text TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS question_counts ("
+                "question_key TEXT PRIMARY KEY, question TEXT, count INTEGER, last_seen REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_counts ("
+                "day TEXT, kind TEXT, key TEXT, count INTEGER, PRIMARY KEY (day, kind, key))"
+            )
+            self._conn = conn
+        return self._conn
+
+    # Cheap enough to call from a rerun: no I/O, no blocking on the writer
+    def track(self, kind, session=None, key=None, text=None):
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._stats["dropped"] += 1
+            self._buffer.append((time.time(), kind, session, key, text))
+            self._stats["tracked"] += 1
+            full = len(self._buffer) >= BATCH_SIZE
+        if full:
+            self._wake.set()
+
+    def page_view(self, session, page):
+        self.track("page_view", session, page)
+
+    # source: "fast_path", "cache", "llm" or "error" (not answered)
+    def chat_turn(self, session, question, source):
+        self.track("chat", session, source, question[:QUESTION_CHARS])
+
+    # Category and outcome only; names, e-mails and messages stay in the outbox
+    def inquiry(self, session, category, status):
+        self.track("inquiry", session, category, status)
+
+    def flush(self):
+        with self._lock:
+            events = list(self._buffer)
+            self._buffer.clear()
+        if not events:
+            return 0
+        start = time.perf_counter()
+        daily, questions = {}, {}
+        for ts, kind, _, key, text in events:
+            # Dropped submissions stay in the log but don't count as inquiries
+            if kind == "inquiry" and text in ("duplicate", "throttled"):
+                continue
+            daily_key = (_day(ts), kind, key or "")
+            daily[daily_key] = daily.get(daily_key, 0) + 1
+            if kind == "chat":
+                question_key = _question_key(text)
+                count, _, _ = questions.get(question_key, (0, text, ts))
+                questions[question_key] = (count + 1, text, ts)
+        with self._db_lock:
+            db = None
+            try:
+                # Opening the database can fail too; the batch must not be lost then either
+                db = self._db()
+                db.execute("BEGIN IMMEDIATE")
+                db.executemany("INSERT INTO events (ts, kind, session, key, text) VALUES (?, ?, ?, ?, ?)", events)
+                db.executemany(
+                    "INSERT INTO daily_counts VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (day, kind, key) DO UPDATE SET count = count + excluded.count",
+                    [(*k, count) for k, count in daily.items()],
+                )
+                db.executemany(
+                    "INSERT INTO question_counts VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (question_key) DO UPDATE SET count = count + excluded.count,"
+                    " question = excluded.question, last_seen = excluded.last_seen",
+                    [(k, text, count, ts) for k, (count, text, ts) in questions.items()],
+                )
+                db.execute("COMMIT")
+            except Exception:
+                if db is not None and db.in_transaction:
+                    db.execute("ROLLBACK")
+                # Put the batch back (ahead of newer events) for the next attempt. extendleft on a
+                # full deque would push out the newest events; drop the batch's oldest instead
+                with self._lock:
+                    overflow = max(0, len(events) + len(self._buffer) - self._buffer.maxlen)
+                    self._stats["dropped"] += overflow
+                    self._buffer.extendleft(reversed(events[overflow:]))
+                raise
+        ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["flushed"] += len(events)
+            self._stats["flushes"] += 1
+            self._stats["last_flush_ms"] = round(ms, 2)
+        profiler.observe("analytics_flush", ms)
+        return len(events)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Keep the worker alive through transient SQLite errors; the batch is re-queued
+                logger.exception("analytics flush failed (%d events buffered)", self.stats()["buffered"])
+
+    # One daemon writer per process, started on first use; whatever is buffered at exit is flushed
+    def start_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+                self._worker.start()
+                atexit.register(self.flush)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, buffered=len(self._buffer))
+
+    # Dashboard queries: aggregate tables only
+    def top_questions(self, limit=20):
+        with self._db_lock:
+            return self._db().execute(
+                "SELECT question, count, last_seen FROM question_counts ORDER BY count DESC, last_seen DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def daily(self, kind, days=30):
+        since = _day(time.time() - days * 86400)
+        with self._db_lock:
+            return self._db().execute(
+                "SELECT day, key, count FROM daily_counts WHERE kind = ? AND day >= ? ORDER BY day, key",
+                (kind, since),
+            ).fetchall()
+
+
+analytics = Analytics(ANALYTICS_PATH)
+
+
+if __name__ == "__main__":
+    # python analytics.py [questions | inquiries | pages]
+    command = sys.argv[1] if len(sys.argv) > 1 else "questions"
+    if command == "questions":
+        for question, count, _ in analytics.top_questions():
+            print(f"{count:6d}  {question}")
+    elif command in ("inquiries", "pages"):
+        for day, key, count in analytics.daily("inquiry" if command == "inquiries" else "page_view"):
+            print(f"{day}  {key:<20} {count:6d}")
+    else:
+        sys.exit(f"unknown command: {command}")
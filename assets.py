@@ -0,0 +1,221 @@
+import base64
+import hashlib
+import html
+import os
+import shutil
+import sys
+import threading
+from functools import lru_cache
+
+from PIL import Image, ImageFilter, features
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DERIVED_DIR = os.path.join(BASE_DIR, "static", "img")
+
+# Pre-generated widths (px) and formats, best compression first
+WIDTHS = (320, 640, 960, 1280)
+FORMATS = tuple(fmt for fmt in ("avif", "webp") if features.check(fmt)) + ("png",)
+DEFAULT_FORMAT = "webp" if "webp" in FORMATS else "png"
+# Inline blur placeholder (LQIP): a few hundred bytes, shown until the real image loads
+LQIP_WIDTH = 24
+LQIP_BLUR = 1.5
+# Where server.enableStaticServing exposes static/img (relative to the app URL)
+STATIC_URL = "app/static/img/"
+
+_SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 6},
+    "png": {"optimize": True},
+}
+_LQIP_OPTIONS = {"webp": {"quality": 40, "method": 6}, "png": {"optimize": True}}
+# Part of every derivative's name: bump when encoding changes so old files are re-rendered
+ENCODING_VERSION = 2
+
+_lock = threading.Lock()
+
+
+def _source_path(name):
+    return os.path.join(BASE_DIR, name)
+
+
+def _stat(name):
+    try:
+        st = os.stat(_source_path(name))
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Content hash of the source (and ENCODING_VERSION), recomputed only when mtime/size change
+@lru_cache(maxsize=32)
+def _source_hash(name, mtime_ns, size):
+    with open(_source_path(name), "rb") as f:
+        return hashlib.sha1(f.read() + str(ENCODING_VERSION).encode()).hexdigest()[:10]
+
+
+# Decode each source once per process (bounded, keyed by mtime/size)
+@lru_cache(maxsize=8)
+def _decode(name, mtime_ns, size):
+    img = Image.open(_source_path(name))
+    img.load()
+    return img
+
+
+def load_image(name):
+    key = _stat(name)
+    if key is None:
+        return None
+    return _decode(name, *key)
+
+
+def _derived_path(name, digest, width, fmt):
+    stem = os.path.splitext(name)[0]
+    return os.path.join(DERIVED_DIR, f"{stem}-{digest}-{width}.{fmt}")
+
+
+def _prune(name, digest):
+    # Drop derivatives left over from a previous version of the source
+    prefix = os.path.splitext(name)[0] + "-"
+    for entry in os.listdir(DERIVED_DIR):
+        if entry.startswith(prefix) and not entry.startswith(prefix + digest + "-"):
+            os.remove(os.path.join(DERIVED_DIR, entry))
+
+
+def _render(name, key, digest, width, fmt, path):
+    img = _decode(name, *key)
+    if width < img.width:
+        height = round(img.height * width / img.width)
+        img = img.resize((width, height), Image.LANCZOS)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    if fmt == "png":
+        # PNG is only the fallback for browsers without AVIF/WebP: a 256-colour palette keeps it
+        # well under the truecolour size (MEDIANCUT has no alpha support)
+        method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        img = img.quantize(256, method=method, dither=Image.Dither.FLOYDSTEINBERG)
+    os.makedirs(DERIVED_DIR, exist_ok=True)
+    _prune(name, digest)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    img.save(tmp, format=fmt.upper(), **_SAVE_OPTIONS[fmt])
+    # Never serve a fallback heavier than the original
+    if fmt == "png" and os.path.getsize(tmp) >= os.path.getsize(_source_path(name)):
+        shutil.copyfile(_source_path(name), tmp)
+    os.replace(tmp, path)
+
+
+def _widths_for(img_width):
+    # Never upscale: widths beyond the source collapse onto the original width
+    widths = [w for w in WIDTHS if w < img_width]
+    return widths + [img_width]
+
+
+def derivative(name, width, fmt=DEFAULT_FORMAT):
+    key = _stat(name)
+    if key is None:
+        return None
+    digest = _source_hash(name, *key)
+    img_width = _decode(name, *key).width
+    width = next((w for w in _widths_for(img_width) if w >= width), img_width)
+    path = _derived_path(name, digest, width, fmt)
+    if not os.path.exists(path):
+        with _lock:
+            if not os.path.exists(path):
+                _render(name, key, digest, width, fmt, path)
+    return path
+
+
+# Smallest pre-generated derivative that covers the requested display width
+def image_path(name, width, fmt=DEFAULT_FORMAT):
+    return derivative(name, width, fmt)
+
+
+# (path, width) for every derivative up to the one image_path() serves for `width`
+def srcset(name, width, fmt=DEFAULT_FORMAT):
+    img = load_image(name)
+    if img is None:
+        return []
+    widths = _widths_for(img.width)
+    limit = next((w for w in widths if w >= width), img.width)
+    return [(derivative(name, w, fmt), w) for w in widths if w <= limit]
+
+
+def _render_placeholder(name, key, path):
+    img = _decode(name, *key).convert("RGB")
+    img = img.resize((LQIP_WIDTH, max(1, round(img.height * LQIP_WIDTH / img.width))), Image.LANCZOS)
+    img = img.filter(ImageFilter.GaussianBlur(LQIP_BLUR))
+    os.makedirs(DERIVED_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    img.save(tmp, format=DEFAULT_FORMAT.upper(), **_LQIP_OPTIONS[DEFAULT_FORMAT])
+    os.replace(tmp, path)
+
+
+def placeholder_path(name):
+    key = _stat(name)
+    if key is None:
+        return None
+    path = _derived_path(name, _source_hash(name, *key), "lqip", DEFAULT_FORMAT)
+    if not os.path.exists(path):
+        with _lock:
+            if not os.path.exists(path):
+                _render_placeholder(name, key, path)
+    return path
+
+
+@lru_cache(maxsize=32)
+def _data_uri(path):
+    with open(path, "rb") as f:
+        return f"data:image/{DEFAULT_FORMAT};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def placeholder(name):
+    path = placeholder_path(name)
+    return _data_uri(path) if path else None
+
+
+def static_url(path):
+    return STATIC_URL + os.path.basename(path)
+
+
+# Responsive <picture> served from static/img: the browser takes the first format it supports
+# (AVIF, WebP, then the PNG <img>) and a width from srcset/sizes, the blurred placeholder holds
+# the box (no layout shift) and, with lazy=True, the file is only fetched when it nears the viewport
+def image_html(name, width, sizes, alt="", lazy=True, priority=False):
+    sources = {fmt: srcset(name, width, fmt) for fmt in FORMATS}
+    fallback = sources.pop(FORMATS[-1])
+    if not fallback:
+        return None
+
+    def candidates(entries):
+        return ", ".join(f"{static_url(path)} {w}w" for path, w in entries)
+
+    img = load_image(name)
+    fetchpriority = ' fetchpriority="high"' if priority else ""
+    return (
+        f'<div class="lazy-image" style="aspect-ratio: {img.width} / {img.height}; '
+        f'background-image: url({placeholder(name)});"><picture>'
+        + "".join(f'<source type="image/{fmt}" srcset="{candidates(entries)}" sizes="{sizes}">'
+                  for fmt, entries in sources.items())
+        + f'<img src="{static_url(fallback[-1][0])}" srcset="{candidates(fallback)}" sizes="{sizes}" '
+        f'width="{img.width}" height="{img.height}" alt="{html.escape(alt)}" '
+        f'loading="{"lazy" if lazy else "eager"}"{fetchpriority} decoding="async"></picture></div>'
+    )
+
+
+def build(names):
+    built = []
+    for name in names:
+        img = load_image(name)
+        if img is None:
+            continue
+        for width in _widths_for(img.width):
+            for fmt in FORMATS:
+                built.append(derivative(name, width, fmt))
+        built.append(placeholder_path(name))
+    return built
+
+
+if __name__ == "__main__":
+    # Pre-generate every derivative, e.g. at image build / deploy time
+    names = sys.argv[1:] or ["burcup.png", "burcup1.png", "burcup2.png"]
+    for path in build(names):
+        print(os.path.relpath(path, BASE_DIR), os.path.getsize(path))
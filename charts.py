@@ -0,0 +1,114 @@
+import math
+
+from fragments import fragment
+
+# Professional Green Palette
+COLORS = ['#2E7D32', '#43A047', '#66BB6A', '#81C784', '#A5D6A7', '#C8E6C9']
+
+
+# Equity donut as a Plotly figure, built once per business.json version.
+# Streamlit only reads the figure, so one instance is shared by every session.
+@fragment
+def equity_figure(data):
+    # Heavy charting dep is only imported when the interactive chart is shown
+    import plotly.graph_objects as go
+
+    shareholders = data["equity_info"]["shareholders"]
+    fig = go.Figure(data=[go.Pie(
+        labels=[s['name'] for s in shareholders],
+        values=[s['equity_percent'] for s in shareholders],
+        hole=0.65,
+        marker=dict(
+            colors=COLORS,
+            line=dict(color='#ffffff', width=3)
+        ),
+        textinfo='label+percent',
+        textposition='outside',
+        pull=[0.1] + [0] * (len(shareholders) - 1), # CEO slice pops out more
+        hoverinfo='label+percent+value',
+        customdata=[s['role'] for s in shareholders],
+        hovertemplate="<b>%{label}</b><br>직함: %{customdata}<br>지분율: %{percent}<br>주식수: %{value}주<extra></extra>"
+    )])
+
+    fig.update_layout(
+        annotations=[
+            dict(
+                text='<b>CIRCLEAF</b><br>Equity',
+                x=0.5, y=0.5,
+                font_size=22,
+                showarrow=False,
+                font_color="#2E7D32"
+            )
+        ],
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=60, b=60, l=60, r=60),
+        height=500,
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=14,
+            font_family="Pretendard, sans-serif"
+        )
+    )
+    return fig
+
+
+def _point(cx, cy, r, angle):
+    # Angles are clockwise from 12 o'clock, like Plotly's default pie direction
+    return cx + r * math.sin(angle), cy - r * math.cos(angle)
+
+
+# Low-bandwidth equity donut: static SVG, no Plotly JS in the browser
+@fragment
+def equity_donut_svg(data):
+    shareholders = data["equity_info"]["shareholders"]
+    total = sum(s['equity_percent'] for s in shareholders) or 1
+    cx, cy, outer = 210, 190, 110
+    inner = outer * 0.65
+    # Plotly sorts slices by size; the CEO (first listed) slice is pulled out
+    order = sorted(range(len(shareholders)), key=lambda i: -shareholders[i]['equity_percent'])
+    paths = []
+    labels = []
+    start = 0.0
+    for i in order:
+        s = shareholders[i]
+        sweep = 2 * math.pi * s['equity_percent'] / total
+        # A single full-circle arc would collapse to nothing
+        end = start + min(sweep, 2 * math.pi - 1e-4)
+        mid = (start + end) / 2
+        dx, dy = (_point(0, 0, outer * 0.1, mid) if i == 0 else (0, 0))
+        large = 1 if end - start > math.pi else 0
+        x1, y1 = _point(cx + dx, cy + dy, outer, start)
+        x2, y2 = _point(cx + dx, cy + dy, outer, end)
+        x3, y3 = _point(cx + dx, cy + dy, inner, end)
+        x4, y4 = _point(cx + dx, cy + dy, inner, start)
+        paths.append(
+            f'<path d="M{x1:.1f},{y1:.1f} A{outer},{outer} 0 {large} 1 {x2:.1f},{y2:.1f} '
+            f'L{x3:.1f},{y3:.1f} A{inner:.1f},{inner:.1f} 0 {large} 0 {x4:.1f},{y4:.1f} Z" '
+            f'fill="{COLORS[i % len(COLORS)]}" stroke="#ffffff" stroke-width="3">'
+            f'<title>{s["name"]} ({s["role"]}): {s["equity_percent"]}% · {s["shares"]:,}주</title></path>'
+        )
+        lx, ly = _point(cx + dx, cy + dy, outer + 18, mid)
+        labels.append([lx, ly, f'{s["name"]} {100 * s["equity_percent"] / total:.3g}%'])
+        start += sweep
+    # Keep labels of neighbouring thin slices apart: push them away from the centre line
+    for side in (True, False):
+        for top in (True, False):
+            group = sorted((l for l in labels if (l[0] >= cx) == side and (l[1] < cy) == top),
+                           key=lambda l: l[1], reverse=top)
+            for prev, label in zip(group, group[1:]):
+                label[1] = min(label[1], prev[1] - 16) if top else max(label[1], prev[1] + 16)
+    texts = [
+        f'<text x="{lx:.1f}" y="{ly:.1f}" text-anchor="{"start" if lx >= cx else "end"}" '
+        f'dominant-baseline="middle" font-size="13" fill="currentColor">{text}</text>'
+        for lx, ly, text in labels
+    ]
+    return f"""
+        <svg viewBox="0 0 420 380" width="100%" role="img" aria-label="CIRCLEAF 지분 구조" style="max-height: 500px;">
+            {''.join(paths)}
+            {''.join(texts)}
+            <text x="{cx}" y="{cy - 6}" text-anchor="middle" font-size="22" font-weight="bold" fill="#2E7D32">CIRCLEAF</text>
+            <text x="{cx}" y="{cy + 20}" text-anchor="middle" font-size="22" fill="#2E7D32">Equity</text>
+        </svg>
+    """
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+
+from llm import BACKEND
+
+# History budget sent with each turn (system prompt excluded)
+CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "2000"))
+# Most recent question/answer pairs always kept verbatim (if they fit the budget)
+KEEP_TURNS = int(os.getenv("CHAT_KEEP_TURNS", "4"))
+SUMMARY_CHARS = 600
+
+SYSTEM_PROMPT = """
+당신은 '주식회사 써클리프(CIRCLEAF)'의 비즈니스 어시스턴트입니다.
+다음은 회사와 제품(버컵, Burcup)에 대한 정보입니다:
+{context}
+
+사용자의 질문에 대해 위의 데이터를 바탕으로 친절하고 전문적으로 답변하십시오.
+데이터에 없는 내용은 아는 범위 내에서 답변하되, 회사 공식 정보가 아님을 명시하십시오.
+한국어로 답변하십시오.
+"""
+
+SUMMARY_PROMPT = """
+당신은 고객 상담 대화를 요약하는 도우미입니다.
+기존 요약과 새로 추가된 대화를 합쳐 {limit}자 이내의 한국어 요약으로 갱신하십시오.
+사용자가 관심을 보인 제품, 수량, 일정, 연락처 등 이후 답변에 필요한 사실만 남기십시오.
+"""
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # No tokenizer data (e.g. offline): fall back to a byte-length estimate
+        return None
+
+
+def count_tokens(text):
+    enc = _encoding()
+    if enc is None:
+        return max(1, len(text.encode("utf-8")) // 3)
+    return len(enc.encode(text))
+
+
+def message_tokens(message):
+    # Per-message framing overhead of the chat format
+    return count_tokens(message.content) + 4
+
+
+# Compact history turns (history.Turn) become langchain messages only in the request payload
+def as_message(m):
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    return HumanMessage(content=m.content) if m.type == "human" else AIMessage(content=m.content)
+
+
+class ChatContext:
+    def __init__(self, budget=CONTEXT_TOKENS, keep_turns=KEEP_TURNS):
+        self.budget = budget
+        self.keep_turns = keep_turns
+        self.summary = ""
+        self.summarized = 0
+        self.turn_stats = []
+
+    # Fold turns that fall outside the window into the running summary
+    def _fold(self, chat, messages):
+        recent = list(messages[self.summarized:])
+        tokens = sum(message_tokens(m) for m in recent)
+        if len(recent) <= self.keep_turns * 2 + 1 and tokens <= self.budget:
+            return
+        # Fold down to half the window so the summary is refreshed every few turns, not every turn
+        keep = max(1, self.keep_turns // 2) * 2 + 1
+        cut = 0
+        while len(recent) - cut > 1 and (len(recent) - cut > keep or tokens > self.budget):
+            # Drop whole question/answer pairs so the window starts on a question
+            for m in recent[cut:cut + 2]:
+                tokens -= message_tokens(m)
+            cut += 2
+        cut = min(cut, len(recent) - 1)
+        if cut <= 0:
+            return
+        folded = recent[:cut]
+        self.summarized += cut
+        self.summary = self._summarize(chat, folded)
+
+    def _summarize(self, chat, folded):
+        from langchain_core.messages import SystemMessage, HumanMessage
+
+        transcript = "\n".join(
+            f"{'사용자' if m.type == 'human' else '챗봇'}: {m.content}" for m in folded
+        )
+        request = [
+            SystemMessage(content=SUMMARY_PROMPT.format(limit=SUMMARY_CHARS)),
+            HumanMessage(content=f"[기존 요약]\n{self.summary or '(없음)'}\n\n[새 대화]\n{transcript}"),
+        ]
+        try:
+            return chat.invoke(request).content[:SUMMARY_CHARS * 2]
+        except Exception:
+            # Summary refresh is best effort; keep the previous one so the payload stays bounded
+            return self.summary
+
+    # Messages to send for this turn: system prompt (+ summary) and the recent window
+    def build(self, chat, system_content, messages):
+        from langchain_core.messages import SystemMessage
+
+        self._fold(chat, messages)
+        if self.summary:
+            system_content += f"\n이전 대화 요약:\n{self.summary}\n"
+        system = SystemMessage(content=system_content)
+        recent = [as_message(m) for m in messages[self.summarized:]]
+        history_tokens = sum(message_tokens(m) for m in recent)
+        system_tokens = message_tokens(system)
+        self.turn_stats.append({
+            "turn": len(self.turn_stats) + 1,
+            "messages": len(recent),
+            "summarized": self.summarized,
+            "system_tokens": system_tokens,
+            "history_tokens": history_tokens,
+            "total_tokens": system_tokens + history_tokens,
+        })
+        return [system] + recent
+
+
+# Streaming UI frames: at most one every CHAT_FRAME_INTERVAL seconds, spaced out further as the answer grows
+FRAME_INTERVAL = float(os.getenv("CHAT_FRAME_INTERVAL", "0.05"))
+FRAME_GROWTH_CHARS = 500
+
+
+class StreamRenderer:
+    def __init__(self, placeholder, interval=FRAME_INTERVAL, cursor="▌"):
+        self.placeholder = placeholder
+        self.interval = interval
+        self.cursor = cursor
+        self.parts = []
+        self.chars = 0
+        self.chunks = 0
+        self.frames = 0
+        self.bytes_sent = 0
+        self._last_frame = time.monotonic()
+
+    def _frame(self, body):
+        self.placeholder.markdown(body)
+        self.frames += 1
+        self.bytes_sent += len(body.encode("utf-8"))
+        self._last_frame = time.monotonic()
+
+    def write(self, text):
+        if not text:
+            return
+        self.parts.append(text)
+        self.chars += len(text)
+        self.chunks += 1
+        # Every frame re-sends the whole answer, so long answers get fewer frames
+        interval = self.interval * max(1.0, self.chars / FRAME_GROWTH_CHARS)
+        if time.monotonic() - self._last_frame >= interval:
+            self._frame("".join(self.parts) + self.cursor)
+
+    def close(self):
+        text = "".join(self.parts)
+        self._frame(text)
+        return text
+
+    def stats(self):
+        return {"chunks": self.chunks, "frames": self.frames, "bytes_sent": self.bytes_sent}
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "500"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+def normalize_question(question):
+    text = unicodedata.normalize("NFKC", question).lower()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+# Answers to standalone questions, keyed by normalized question + business.json version
+class AnswerCache:
+    def __init__(self, path, max_entries=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._version = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, question TEXT, answer TEXT, created REAL, used REAL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._conn = conn
+        return self._conn
+
+    # Flush every entry once business.json changes
+    def _check_version(self, db, version):
+        if version == self._version:
+            return
+        row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != version:
+            db.execute("DELETE FROM answers")
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+        self._version = version
+
+    def _key(self, question, version):
+        return hashlib.sha256(f"{version}\n{normalize_question(question)}".encode()).hexdigest()
+
+    def get(self, question, version):
+        key = self._key(question, version)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            self._check_version(db, version)
+            row = db.execute("SELECT answer, created FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                db.execute("DELETE FROM answers WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE answers SET used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, question, version, answer):
+        key = self._key(question, version)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            self._check_version(db, version)
+            db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                (key, normalize_question(question), answer, now, now),
+            )
+            # Expire by TTL, then evict least recently used beyond the size cap
+            db.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl,))
+            db.execute(
+                "DELETE FROM answers WHERE key IN ("
+                "SELECT key FROM answers ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            size = self._db().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+
+# Fake-backend answers go to their own file so they never reach real users
+answer_cache = AnswerCache(os.path.join(
+    CACHE_DIR, "answers.sqlite3" if BACKEND == "openai" else f"answers-{BACKEND}.sqlite3"
+))
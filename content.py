@@ -0,0 +1,78 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+logger = logging.getLogger(__name__)
+
+# One immutable view of business.json; `version` is its content hash
+Snapshot = namedtuple("Snapshot", ["data", "version", "text"])
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Serialize a frozen snapshot back to JSON (read-only mappings become objects)
+def dumps(data, **kwargs):
+    return json.dumps(data, default=dict, **kwargs)
+
+
+class ContentStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stat = None
+        self._snapshot = None
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        if self._snapshot is not None and self._snapshot.version == version:
+            # Touched but unchanged: keep the same snapshot object
+            return self._snapshot
+        text = raw.decode("utf-8")
+        return Snapshot(_freeze(json.loads(text)), version, text)
+
+    # Current snapshot; business.json is re-read only when its mtime/size change.
+    # A file that is missing, caught mid-write or invalid keeps the last good snapshot
+    # (only the very first load has nothing to fall back on and raises).
+    def get(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._snapshot is None:
+                raise
+            # Logged once; the next successful stat differs from None and reloads
+            if self._stat is not None:
+                logger.exception("business.json unavailable, serving version %s", self._snapshot.version)
+                self._stat = None
+            return self._snapshot
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat:
+            return self._snapshot
+        with self._lock:
+            if stat != self._stat:
+                try:
+                    self._snapshot = self._load()
+                except (OSError, ValueError):
+                    if self._snapshot is None:
+                        raise
+                    logger.exception("business.json could not be loaded, serving version %s", self._snapshot.version)
+                # Retried once the file changes again, not on every rerun
+                self._stat = stat
+        return self._snapshot
+
+
+# Process-wide store shared by every session
+business_store = ContentStore(os.path.join(BASE_DIR, "business.json"))
@@ -0,0 +1,295 @@
+import functools
+import threading
+
+
+# Memoize a fragment per business.json version: a rerun reuses the built markup
+def fragment(render):
+    cache = {}
+    lock = threading.Lock()
+    state = {"version": None}
+
+    @functools.wraps(render)
+    def cached(snapshot, *args):
+        key = (snapshot.version,) + args
+        html = cache.get(key)
+        if html is None:
+            html = render(snapshot.data, *args)
+            with lock:
+                # Drop markup built from an older content version
+                if state["version"] != snapshot.version:
+                    cache.clear()
+                    state["version"] = snapshot.version
+                cache[key] = html
+        return html
+
+    cached.uncached = lambda snapshot, *args: render(snapshot.data, *args)
+    return cached
+
+
+# Home: value propositions
+@fragment
+def value_props(data):
+    return tuple(f"""
+                <div class="value-prop">
+                    <span class="value-prop-icon">{p['icon']}</span>
+                    <b class="value-prop-title">{p['title']}</b>
+                    <p class="value-prop-desc">{p['desc']}</p>
+                </div>
+            """ for p in data["product_info"]["value_props"])
+
+
+# Home: impact metrics
+@fragment
+def impact_cards(data):
+    return tuple(f"""
+            <div class="impact-card">
+                <p class="impact-label">{m['label']}</p>
+                <h2 class="impact-value">{m['value']}</h2>
+            </div>
+        """ for m in data["product_info"]["impact"])
+
+
+# Product: feature cards
+@fragment
+def feature_cards(data):
+    return tuple(f"""
+                    <div class="feature-card">
+                        <div class="card-header">
+                            <span class="feature-icon">{f['icon']}</span>
+                            <span class="feature-title">{f['title']}</span>
+                        </div>
+                        <p class="feature-desc">{f['desc']}</p>
+                    </div>
+                """ for f in data["product_info"]["features"])
+
+
+# Product: manufacturing timeline as (marker, card) pairs
+@fragment
+def process_steps(data):
+    steps = data["product_info"]["manufacturing_process"]
+    rendered = []
+    for i, s in enumerate(steps):
+        line_html = "<div class='step-line'></div>" if i < len(steps)-1 else ""
+        marker = f"""
+                    <div class="step-marker">
+                        <div class="step-number">{i+1}</div>
+                        {line_html}
+                    </div>
+                """
+        card = f"""
+                    <div class="step-card">
+                        <div class="card-header">
+                            <span class="step-icon">{s['icon']}</span>
+                            <b class="step-title">{s['step']}</b>
+                        </div>
+                        <p class="step-desc">{s['desc']}</p>
+                    </div>
+                """
+        rendered.append((marker, card))
+    return tuple(rendered)
+
+
+# Product: SWOT cards
+@fragment
+def swot_cards(data):
+    rendered = []
+    for item in data["product_info"]["swot"]:
+        content_html = "".join([f"<li>{c}</li>" for c in item['content']])
+        rendered.append(f"""
+                    <div class="swot-card" style="background: {item['color']}; border-left-color: {item['border']};">
+                        <div class="card-header">
+                            <span class="swot-icon">{item['icon']}</span>
+                            <b class="swot-title">{item['title']}</b>
+                        </div>
+                        <ul class="swot-list">
+                            {content_html}
+                        </ul>
+                    </div>
+                """)
+    return tuple(rendered)
+
+
+# Business model: canvas grid
+@fragment
+def business_canvas(data):
+    bmc = data["business_model"]["canvas"]
+    boxes = "".join(f"""
+            <div class="bmc-box {key.lower()}">
+                <div class="bmc-title">{box['title']}</div>
+                <div class="bmc-icon">{box['icon']}</div>
+                <div class="bmc-content">{box['content']}</div>
+            </div>""" for key, box in bmc.items())
+    return """
+        <div class="bmc-container">""" + boxes + """
+        </div>
+    """
+
+
+# Equity: headline metrics
+@fragment
+def equity_metrics(data):
+    equity = data["equity_info"]
+    metrics = [
+        ("총 발행주식 수", f"{equity['total_shares']:,}주"),
+        ("총 주주", f"{len(equity['shareholders'])}명"),
+        ("액면가", f"{equity['par_value']:,}원"),
+    ]
+    return tuple(f"""
+            <div class="metric-card">
+                <p class="metric-label">{label}</p>
+                <h2 class="metric-value">{value}</h2>
+            </div>
+        """ for label, value in metrics)
+
+
+# Equity: shareholder register (largest holder highlighted)
+@fragment
+def equity_table(data):
+    shareholders = data["equity_info"]["shareholders"]
+    top = max(shareholders, key=lambda s: s["shares"])["name"]
+    table_content = """
+        <table class="equity-table">
+            <thead>
+                <tr>
+                    <th>순번</th>
+                    <th>주주명</th>
+                    <th>직함</th>
+                    <th>주식 수</th>
+                    <th>지분율</th>
+                </tr>
+            </thead>
+            <tbody>
+        """
+    for index, row in enumerate(shareholders, start=1):
+        row_class = "highlight-row" if row['name'] == top else ""
+        table_content += f'<tr class="{row_class}">'
+        table_content += f'<td>{index}</td>'
+        table_content += f'<td>{row["name"]}</td>'
+        table_content += f'<td>{row["role"]}</td>'
+        table_content += f'<td>{row["shares"]:,}</td>'
+        table_content += f'<td class="equity-percent">{row["equity_percent"]}%</td>'
+        table_content += '</tr>'
+    table_content += "</tbody></table>"
+    return table_content
+
+
+# Equity: footnote
+@fragment
+def equity_note(data):
+    equity = data["equity_info"]
+    year, month, day = (int(part) for part in equity["as_of"].split("-"))
+    return f"""
+            <div class="equity-note">
+                <p class="note-line">* 위 데이터는 {year}년 {month}월 {day}일 기준 데이터입니다.</p>
+                <p class="note-line">* 모든 주식은 {equity['share_type']}로 구성되어 있습니다.</p>
+            </div>
+        """
+
+
+# Partnership: partner type cards
+@fragment
+def partner_cards(data):
+    return tuple(f"""
+                <div class="partner-card">
+                    <div class="partner-icon">{p['icon']}</div>
+                    <b class="partner-title">{p['title']}</b>
+                    <p class="partner-desc">{p['desc']}</p>
+                </div>
+            """ for p in data["partnership"]["partners"])
+
+
+# Partnership: contact details
+@fragment
+def contact_info(data):
+    company = data["company_info"]
+    contact = company["contact"]
+    return f"""
+            <div class="contact-info">
+                <p>📍 <b>본사</b>: {company['location']}</p>
+                <p>📧 <b>이메일</b>: {contact['email']}</p>
+                <p>📞 <b>대표번호</b>: {contact['phone']}</p>
+                <p>⏰ <b>운영시간</b>: {contact['hours']}</p>
+            </div>
+        """
+
+
+# Roadmap: incorporation summary
+@fragment
+def corp_card(data):
+    company = data["company_info"]
+    year, month, day = (int(part) for part in company["establishment_date"].split("-"))
+    return f"""
+        <div class="corp-card">
+            <h3 class="corp-title">🏢 법인 설립 정보</h3>
+            <div class="corp-grid">
+                <div>
+                    <p class="corp-label">회사명</p>
+                    <b class="corp-value">{company['name']}</b>
+                </div>
+                <div>
+                    <p class="corp-label">설립 예정일</p>
+                    <b class="corp-value">{year}년 {month}월 {day}일</b>
+                </div>
+                <div>
+                    <p class="corp-label">대표자</p>
+                    <b class="corp-value">{company['ceo']}</b>
+                </div>
+                <div>
+                    <p class="corp-label">주요 업종</p>
+                    <b class="corp-value corp-value-sm">{company['industry_short']}</b>
+                </div>
+            </div>
+        </div>
+    """
+
+
+# Roadmap: trademark / IP plan
+@fragment
+def brand_ip(data):
+    ip = data["future_plans"]["brand_ip"]
+    return f"""
+            <div class="ip-card">
+                <h4 class="ip-title">{ip['title']}</h4>
+                <p><b>'{ip['brand']}'</b> {ip['desc']}</p>
+                <ul class="ip-list">
+                    <li><b>출원인:</b> {ip['applicant']}</li>
+                    <li><b>진행 일정:</b> {ip['schedule']}</li>
+                </ul>
+            </div>
+        """
+
+
+# Roadmap: (stage title, plan cards) per milestone; tone colours the title, accent the card
+@fragment
+def milestones(data):
+    stages = []
+    for stage in data["future_plans"]["milestones"]:
+        cards = []
+        for card in stage["cards"]:
+            card_class = f"plan-card plan-{card['tone']}" if card["accent"] else "plan-card"
+            title_class = f"plan-title tone-{card['tone']}" if card["tone"] else "plan-title"
+            items = "\n".join(
+                f"                        <li><b>{item['label']}:</b> {item['text']}</li>" for item in card["items"]
+            )
+            cards.append(f"""
+                <div class="{card_class}">
+                    <b class="{title_class}">{card['title']}</b>
+                    <ul class="plan-list">
+{items}
+                    </ul>
+                </div>
+            """)
+        stages.append((stage["title"], tuple(cards)))
+    return tuple(stages)
+
+
+# Every page: footer
+@fragment
+def footer(data):
+    company = data["company_info"]
+    year = company["establishment_date"].split("-")[0]
+    return f"""
+    <div class="site-footer">
+        <p>© {year} {company['short_name']} | {company['brand_name']} | {company['location']} | {company['contact']['email']}</p>
+    </div>
+    """
@@ -0,0 +1,287 @@
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+HISTORY_PATH = os.getenv("CHAT_HISTORY_PATH", os.path.join(CACHE_DIR, "chat_history.sqlite3"))
+
+# Message bytes a session keeps in memory; older turns spill to disk
+HISTORY_BYTES = int(os.getenv("CHAT_HISTORY_BYTES", "16384"))
+# Sessions untouched this long are moved to disk entirely (open but idle tabs)
+IDLE_MINUTES = float(os.getenv("CHAT_IDLE_MINUTES", "30"))
+# Spilled turns of sessions inactive this long are deleted
+RETENTION_HOURS = float(os.getenv("CHAT_HISTORY_RETENTION_HOURS", "24"))
+SWEEP_SECONDS = 60
+
+
+# One message: interned role ("human" / "ai") and UTF-8 content, no per-instance dict
+class Turn:
+    __slots__ = ("role", "data")
+
+    def __init__(self, role, content):
+        self.role = sys.intern(role)
+        self.data = content.encode("utf-8") if isinstance(content, str) else content
+
+    # Same read interface as langchain messages (.type / .content)
+    @property
+    def type(self):
+        return self.role
+
+    @property
+    def content(self):
+        return self.data.decode("utf-8")
+
+    def size(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.data)
+
+
+# A session's conversation. Indexes are absolute (0 = first turn ever), so ChatContext's
+# offsets stay valid; turns[0] is turn number `offset`, everything before it is on disk.
+# The lock keeps the janitor's spill from racing a rerun's append, restore or read.
+class ChatHistory:
+    __slots__ = ("session_id", "store", "turns", "offset", "bytes", "last_used", "lock", "__weakref__")
+
+    def __init__(self, session_id, store):
+        self.session_id = session_id
+        self.store = store
+        self.turns = []
+        self.offset = 0
+        self.bytes = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return self.offset + len(self.turns)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            index = range(len(self))[index]
+            return self[index:index + 1][0]
+        with self.lock:
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("history slices must be contiguous")
+            head = []
+            if start < self.offset:
+                head = self.store.load(self.session_id, start, min(stop, self.offset))
+            return head + self.turns[max(start, self.offset) - self.offset:max(stop, self.offset) - self.offset]
+
+    def append(self, role, content):
+        turn = Turn(role, content)
+        with self.lock:
+            self.turns.append(turn)
+            self.bytes += len(turn.data)
+            self.last_used = time.monotonic()
+            # Over the cap: spill the oldest turns, always keeping the latest question/answer in memory
+            excess, count = self.bytes - self.store.max_bytes, 0
+            while excess > 0 and count < len(self.turns) - 2:
+                excess -= len(self.turns[count].data)
+                count += 1
+            if count:
+                self.spill(count)
+
+    def spill(self, count):
+        with self.lock:
+            turns = self.turns[:count]
+            # An idle eviction is not activity: record when the session was last used
+            last_seen = time.time() - (time.monotonic() - self.last_used)
+            self.store.save(self.session_id, self.offset, turns, last_seen)
+            del self.turns[:count]
+            self.offset += count
+            self.bytes -= sum(len(t.data) for t in turns)
+
+    # Evicted session back in use: reload its latest turns, up to half the cap
+    def restore(self):
+        with self.lock:
+            if self.turns or not self.offset:
+                return False
+            tail = self.store.load(self.session_id, max(0, self.offset - 20), self.offset)
+            budget, keep = self.store.max_bytes // 2, 0
+            while keep < len(tail) and (keep < 2 or budget >= len(tail[-keep - 1].data)):
+                budget -= len(tail[-keep - 1].data)
+                keep += 1
+            self.turns = tail[len(tail) - keep:]
+            self.bytes = sum(len(t.data) for t in self.turns)
+            self.offset -= len(self.turns)
+            return True
+
+    # Its spilled turns were deleted by retention: start over empty
+    def reset(self):
+        with self.lock:
+            self.turns = []
+            self.offset = 0
+            self.bytes = 0
+
+    def memory(self):
+        return sys.getsizeof(self.turns) + sum(t.size() for t in self.turns)
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_PATH, max_bytes=HISTORY_BYTES, idle_minutes=IDLE_MINUTES,
+                 retention_hours=RETENTION_HOURS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_minutes * 60
+        self.retention_seconds = retention_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = None
+        # Dropped together with the Streamlit session that holds the history
+        self._sessions = weakref.WeakValueDictionary()
+        self._worker = None
+        self._stats = {"spilled_turns": 0, "evicted_sessions": 0, "restored_sessions": 0, "expired_sessions": 0}
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS turns ("
+                "session TEXT, seq INTEGER, role TEXT, content BLOB, saved REAL, PRIMARY KEY (session, seq))"
+            )
+            # Retention is per session, by its last activity, not by when a turn was spilled
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions (session TEXT PRIMARY KEY, last_seen REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)")
+            conn.execute("DROP INDEX IF EXISTS turns_saved")
+            # Turns spilled before the sessions table existed
+            conn.execute(
+                "INSERT OR IGNORE INTO sessions SELECT session, MAX(saved) FROM turns GROUP BY session"
+            )
+            self._conn = conn
+        return self._conn
+
+    def save(self, session_id, offset, turns, last_seen):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            try:
+                db.executemany(
+                    "INSERT OR REPLACE INTO turns VALUES (?, ?, ?, ?, ?)",
+                    [(session_id, offset + i, t.role, t.data, now) for i, t in enumerate(turns)],
+                )
+                db.execute(
+                    "INSERT INTO sessions VALUES (?, ?)"
+                    " ON CONFLICT (session) DO UPDATE SET last_seen = MAX(last_seen, excluded.last_seen)",
+                    (session_id, last_seen),
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self._stats["spilled_turns"] += len(turns)
+
+    def load(self, session_id, start, stop):
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT role, content FROM turns WHERE session = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (session_id, start, stop),
+            ).fetchall()
+        return [Turn(role, bytes(content)) for role, content in rows]
+
+    # The session's history, created on first use; an evicted one is reloaded from disk
+    def get(self, session_id):
+        self.start_janitor()
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                history = self._sessions[session_id] = ChatHistory(session_id, self)
+        if history.restore():
+            with self._lock:
+                self._stats["restored_sessions"] += 1
+        history.last_used = time.monotonic()
+        return history
+
+    # Move idle sessions to disk; delete the turns of sessions inactive past the retention period
+    def sweep(self):
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            histories = list(self._sessions.values())
+        idle = 0
+        for history in histories:
+            with history.lock:
+                if history.turns and now - history.last_used > self.idle_seconds:
+                    history.spill(len(history.turns))
+                    idle += 1
+        cutoff = wall - self.retention_seconds
+        with self._lock:
+            self._stats["evicted_sessions"] += idle
+            db = self._db()
+            db.execute("BEGIN")
+            try:
+                # Live sessions' last activity, so a long conversation keeps its early turns
+                db.executemany(
+                    "UPDATE sessions SET last_seen = MAX(last_seen, ?) WHERE session = ?",
+                    [(wall - (now - h.last_used), h.session_id) for h in histories if h.offset],
+                )
+                expired = [row[0] for row in
+                           db.execute("SELECT session FROM sessions WHERE last_seen < ?", (cutoff,))]
+                db.executemany("DELETE FROM turns WHERE session = ?", [(s,) for s in expired])
+                db.executemany("DELETE FROM sessions WHERE session = ?", [(s,) for s in expired])
+                db.execute("COMMIT")
+            except Exception:
+                # A transaction left open would make every later save and sweep fail too
+                db.execute("ROLLBACK")
+                raise
+            self._stats["expired_sessions"] += len(expired)
+        expired = set(expired)
+        for history in histories:
+            if history.session_id in expired:
+                history.reset()
+        return idle
+
+    def start_janitor(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is not None:
+                return
+
+            def run():
+                while True:
+                    time.sleep(SWEEP_SECONDS)
+                    try:
+                        self.sweep()
+                    except Exception:
+                        # Keep sweeping, but a locked or corrupt database must not go unnoticed:
+                        # until it recovers, nothing expires and disk history keeps growing
+                        logger.exception("chat history sweep failed (%s)", self.path)
+
+            self._worker = threading.Thread(target=run, name="chat-history-janitor", daemon=True)
+            self._worker.start()
+
+    # Bytes per live session and process totals
+    def report(self):
+        now = time.monotonic()
+        with self._lock:
+            histories = list(self._sessions.values())
+            disk_turns = self._db().execute("SELECT COUNT(*) FROM turns").fetchone()[0]
+            stats = dict(self._stats)
+        sessions = [{
+            "session": h.session_id[:8],
+            "turns": len(h),
+            "in_memory": len(h.turns),
+            "content_bytes": h.bytes,
+            "memory_bytes": h.memory(),
+            "idle_s": round(now - h.last_used),
+        } for h in histories]
+        return {
+            "sessions": sessions,
+            "totals": {
+                "sessions": len(sessions),
+                "in_memory_turns": sum(s["in_memory"] for s in sessions),
+                "content_bytes": sum(s["content_bytes"] for s in sessions),
+                "memory_bytes": sum(s["memory_bytes"] for s in sessions),
+                "disk_turns": disk_turns,
+                **stats,
+            },
+        }
+
+
+history_store = HistoryStore()
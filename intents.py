@@ -0,0 +1,155 @@
+import os
+import threading
+import unicodedata
+
+# Below this confidence the question goes to the LLM
+MIN_CONFIDENCE = float(os.getenv("FASTPATH_MIN_CONFIDENCE", "0.8"))
+MAX_QUESTION_CHARS = 30
+
+# Words that ask for reasoning or comparison rather than a stored fact
+COMPLEX_CUES = ("왜", "어떻게", "비교", "차이", "추천", "가능", "할 수", "장단점", "그리고", "또한")
+
+
+def _contact(data):
+    contact = data["company_info"]["contact"]
+    return (
+        f"써클리프(CIRCLEAF) 연락처 안내입니다.\n\n"
+        f"- 📞 대표번호: {contact['phone']}\n"
+        f"- 📧 이메일: {contact['email']}\n"
+        f"- ⏰ 운영시간: {contact['hours']}"
+    )
+
+
+def _location(data):
+    return f"써클리프(CIRCLEAF) 본사는 **{data['company_info']['location']}**에 있습니다."
+
+
+def _equity(data):
+    equity = data["equity_info"]
+    lines = [
+        f"- {s['name']} ({s['role']}): {s['equity_percent']}% · {s['shares']:,}주"
+        for s in equity["shareholders"]
+    ]
+    return (
+        f"써클리프(CIRCLEAF)의 총 발행주식은 {equity['total_shares']:,}주"
+        f"(액면가 {equity['par_value']:,}원, {equity['share_type']})이며 주주 구성은 다음과 같습니다.\n\n"
+        + "\n".join(lines)
+        + f"\n\n({equity['as_of']} 기준)"
+    )
+
+
+def _biodegradation(data):
+    product = data["product_info"]
+    period = next(m["value"] for m in product["impact"] if "생분해" in m["label"])
+    detail = next(f["desc"] for f in product["features"] if "생분해" in f["title"])
+    return f"버컵(Burcup)의 생분해 기간은 **{period}**입니다. {detail}"
+
+
+# (name, phrases, answer builder). A phrase matches whole words of the question, the last
+# one optionally followed by a particle or ending ("주소는", "번호로"), never as a substring:
+# "주식회사" is not "주식", "사업자등록번호" is not a phone number. Generic words such as
+# "번호", "주소" or "썩" only count inside a phrase that pins them to the company.
+INTENTS = [
+    ("contact", ("이메일 주소", "메일 주소", "연락처", "대표번호", "대표 번호", "전화번호", "전화", "이메일",
+                 "메일", "운영시간", "영업시간", "상담시간"), _contact),
+    ("location", ("본사 주소", "회사 주소", "공장 주소", "본사 위치", "회사 위치", "공장 위치", "생산 공장", "위치",
+                  "소재지", "본사", "공장", "어디에 있"), _location),
+    ("equity", ("지분", "지분율", "지분 구조", "주주", "주주 구성", "주주 수", "주식 수", "발행주식", "발행주식 수"),
+     _equity),
+    ("biodegradation", ("생분해", "생분해되", "분해 기간", "분해되", "썩는 기간", "썩나요", "썩어요", "썩는지", "퇴비"),
+     _biodegradation),
+]
+
+# Particles and endings allowed after a phrase's last word
+PARTICLES = (
+    "", "은", "는", "이", "가", "을", "를", "의", "도", "만", "로", "으로", "에", "에서", "요", "이요", "은요", "는요",
+    "이에요", "예요", "인가요", "가요", "이랑", "랑", "하고", "나요", "는지",
+)
+# Question words and names that don't change what is being asked; any other word left
+# after the phrases are taken out means the question is about something else
+FILLER = (
+    "써클리프", "circleaf", "버컵", "burcup", "주식회사", "회사", "귀사", "제품", "좀", "혹시", "그", "저", "제",
+    "알려줘", "알려주세요", "알려", "주세요", "줘", "뭐예요", "뭐야", "뭔가요", "무엇인가요", "무엇", "뭐",
+    "어디", "어디야", "어디예요", "어디인가요", "어디에", "어디에요", "어디죠", "있나요", "있어요", "있죠",
+    "어떻게", "되나요", "돼요", "되죠", "되어", "얼마나", "얼마", "걸리나요", "걸려요", "걸려서", "몇", "명", "며칠",
+    "궁금해요", "궁금합니다", "궁금한데요", "문의", "기간", "구성", "현황", "정보",
+)
+
+_lock = threading.Lock()
+# Questions by final answer: fast path, shared answer cache, or LLM (errors included)
+_stats = {"local": 0, "cache": 0, "llm": 0}
+
+
+def _normalize(question):
+    return " ".join(unicodedata.normalize("NFKC", question).lower().split())
+
+
+def _words(text):
+    return [w.strip("?!.,~·…()'\"") for w in text.split()]
+
+
+def _is_word(word, stem):
+    return word.startswith(stem) and word[len(stem):] in PARTICLES
+
+
+# Start of the first match of a phrase in the question's words, or None
+def _find(words, phrase):
+    parts = phrase.split()
+    for i in range(len(words) - len(parts) + 1):
+        if words[i:i + len(parts) - 1] == parts[:-1] and _is_word(words[i + len(parts) - 1], parts[-1]):
+            return i, len(parts)
+    return None
+
+
+def match(question):
+    text = _normalize(question)
+    words = [w for w in _words(text) if w]
+    covered = [False] * len(words)
+    matched = []
+    # Intents take their phrases in order, longest first, and consume the words:
+    # "이메일 주소" counts as contact only, not also as location
+    for name, phrases, build in INTENTS:
+        found = False
+        for phrase in sorted(phrases, key=lambda p: -len(p.split())):
+            span = _find([w if not covered[i] else "" for i, w in enumerate(words)], phrase)
+            if span:
+                start, length = span
+                covered[start:start + length] = [True] * length
+                found = True
+        if found:
+            matched.append((name, build))
+    if not matched:
+        return None, None, 0.0
+    name, build = matched[0]
+    confidence = 0.95
+    if len(matched) > 1:
+        confidence -= 0.3
+    if len(text) > MAX_QUESTION_CHARS:
+        confidence -= 0.2
+    # "어떻게 되나요" just asks for the value
+    if any(cue in text.replace("어떻게 되", "") for cue in COMPLEX_CUES):
+        confidence -= 0.3
+    # Words the intent doesn't cover ("배송 주소", "사업자등록번호"): let retrieval answer
+    if any(not c and not any(_is_word(w, f) for f in FILLER) for w, c in zip(words, covered)):
+        confidence -= 0.3
+    return name, build, confidence
+
+
+# Local answer for a stored fact, or None to hand the question on (answer cache, then LLM)
+def answer(question, snapshot):
+    name, build, confidence = match(question)
+    local = build is not None and confidence >= MIN_CONFIDENCE
+    return build(snapshot.data) if local else None
+
+
+# Called once per question with where its answer came from ("fast_path", "cache", "llm",
+# "error"), after the answer cache lookup, so cache hits don't count as LLM answers
+def record(source):
+    with _lock:
+        _stats[{"fast_path": "local", "cache": "cache"}.get(source, "llm")] += 1
+
+
+def stats():
+    with _lock:
+        total = sum(_stats.values())
+        return dict(_stats, local_share=round(_stats["local"] / total, 3) if total else 0.0)
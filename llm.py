@@ -0,0 +1,246 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import httpx
+
+DEFAULT_MODEL = "gpt-5-nano-2025-08-07"
+# "openai" (default) or "fake" for offline runs and benchmarks
+BACKEND = os.getenv("LLM_BACKEND", "openai")
+
+_clients = {}
+_lock = threading.Lock()
+_stats = {"requests": 0, "new_connections": 0}
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+# httpcore trace hook: fires connect events only when the pool opens a new socket
+def _trace(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        _count("new_connections")
+
+
+def _on_request(request):
+    request.extensions["trace"] = _trace
+    _count("requests")
+
+
+def _http_client():
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=120),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        event_hooks={"request": [_on_request]},
+    )
+
+
+# One ChatOpenAI (and keep-alive connection pool) per (model, key, temperature), shared by all sessions
+def get_chat_model(api_key, model=DEFAULT_MODEL, temperature=0.7):
+    key = (BACKEND, model, hashlib.sha256((api_key or "").encode()).hexdigest(), temperature)
+    chat = _clients.get(key)
+    if chat is None:
+        with _lock:
+            chat = _clients.get(key)
+            if chat is None and BACKEND == "fake":
+                chat = FakeChatModel()
+                _clients[key] = chat
+            elif chat is None:
+                from langchain_openai import ChatOpenAI
+                chat = ChatOpenAI(
+                    model=model,
+                    api_key=api_key,
+                    temperature=temperature,
+                    streaming=True,
+                    # Retries happen in LLMScheduler.stream; client retries would multiply them
+                    # while the request holds a scheduler slot
+                    max_retries=0,
+                    http_client=_http_client(),
+                )
+                _clients[key] = chat
+    return chat
+
+
+def connection_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["clients"] = len(_clients)
+    stats["reused_connections"] = max(stats["requests"] - stats["new_connections"], 0)
+    return stats
+
+
+# Offline stand-in for ChatOpenAI, configured by the FAKE_LLM_* variables
+class FakeLLMError(Exception):
+    def __init__(self, message, status_code=429):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeChatModel:
+    def __init__(self, ttft=None, tokens_per_sec=None, answer_tokens=None, failure_rate=None, seed=None):
+        env = os.getenv
+        self.ttft = float(env("FAKE_LLM_TTFT", "0.4") if ttft is None else ttft)
+        self.tokens_per_sec = float(env("FAKE_LLM_TOKENS_PER_SEC", "60") if tokens_per_sec is None else tokens_per_sec)
+        self.answer_tokens = int(env("FAKE_LLM_ANSWER_TOKENS", "120") if answer_tokens is None else answer_tokens)
+        self.failure_rate = float(env("FAKE_LLM_FAILURE_RATE", "0") if failure_rate is None else failure_rate)
+        self._random = random.Random(seed)
+
+    def _answer(self, messages):
+        question = next((m.content for m in reversed(messages) if m.type == "human"), "")
+        words = f"'{question[:40]}'에 대한 테스트 응답입니다. 버컵은 버섯 폐배지로 만든 친환경 컵홀더입니다.".split()
+        return [words[i % len(words)] + " " for i in range(self.answer_tokens)]
+
+    def stream(self, messages):
+        if self._random.random() < self.failure_rate:
+            time.sleep(self.ttft / 2)
+            raise FakeLLMError("Error code: 429 - fake rate limit")
+        time.sleep(self.ttft)
+        delay = 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0
+        for i, token in enumerate(self._answer(messages)):
+            if i:
+                time.sleep(delay)
+            yield SimpleNamespace(content=token)
+
+    def invoke(self, messages):
+        return SimpleNamespace(content="".join(chunk.content for chunk in self.stream(messages)))
+
+
+# Process-wide limit on in-flight LLM calls, shared by every session
+MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "120"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = 0.5
+
+
+class QueueFullError(Exception):
+    pass
+
+
+# What the OpenAI client would have retried itself (it runs with max_retries=0): rate limits,
+# timeouts, conflicts, server errors and dropped connections
+def _is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+
+class LLMScheduler:
+    def __init__(self, max_inflight=MAX_INFLIGHT, max_queue=MAX_QUEUE, timeout=QUEUE_TIMEOUT):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._inflight = 0
+        # session id -> waiting tickets; dict order is the round-robin order
+        self._queues = {}
+        self._waits = deque(maxlen=1000)
+        self._counters = {"granted": 0, "rejected": 0, "timeouts": 0, "retries": 0, "max_depth": 0}
+
+    def _depth(self):
+        return sum(len(q) for q in self._queues.values())
+
+    # Round-robin over sessions: one ticket per session per round
+    def _order(self):
+        queues = [list(q) for q in self._queues.values()]
+        order = []
+        for round_ in range(max((len(q) for q in queues), default=0)):
+            order.extend(q[round_] for q in queues if round_ < len(q))
+        return order
+
+    def _position(self, ticket):
+        return self._order().index(ticket) + 1
+
+    def acquire(self, session_id, on_wait=None):
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            if self._depth() >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise QueueFullError("LLM queue is full")
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            self._counters["max_depth"] = max(self._counters["max_depth"], self._depth())
+        while True:
+            with self._cond:
+                if self._inflight < self.max_inflight and self._order()[0] is ticket:
+                    queue = self._queues.pop(session_id)
+                    queue.popleft()
+                    if queue:
+                        # Served sessions go to the back of the round-robin order
+                        self._queues[session_id] = queue
+                    self._inflight += 1
+                    self._counters["granted"] += 1
+                    self._waits.append(time.monotonic() - start)
+                    return
+                if time.monotonic() - start > self.timeout:
+                    self._queues[session_id].remove(ticket)
+                    if not self._queues[session_id]:
+                        del self._queues[session_id]
+                    self._counters["timeouts"] += 1
+                    self._cond.notify_all()
+                    raise QueueFullError("Timed out waiting for an LLM slot")
+                position = self._position(ticket)
+                self._cond.wait(0.5)
+            if on_wait is not None:
+                on_wait(position)
+
+    def release(self):
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    # Stream through a slot; 429s (and other transient errors) before the first chunk are
+    # retried with jittered backoff. This is the only retry layer: the client doesn't retry
+    def stream(self, session_id, chat, messages, on_wait=None):
+        attempt = 0
+        while True:
+            self.acquire(session_id, on_wait)
+            started = False
+            try:
+                for chunk in chat.stream(messages):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not _is_retryable(e) or attempt >= MAX_RETRIES:
+                    raise
+            finally:
+                self.release()
+            attempt += 1
+            with self._cond:
+                self._counters["retries"] += 1
+            time.sleep(random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt))
+
+    def metrics(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            metrics = dict(self._counters, inflight=self._inflight, queue_depth=self._depth())
+        if waits:
+            metrics["wait_p50_s"] = round(waits[len(waits) // 2], 3)
+            metrics["wait_p95_s"] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3)
+        return metrics
+
+
+scheduler = LLMScheduler()
+
+
+# A chat model bound to one session: every call goes through the shared scheduler
+class ScheduledChat:
+    def __init__(self, chat, session_id, on_wait=None, scheduler=scheduler):
+        self.chat = chat
+        self.session_id = session_id
+        self.on_wait = on_wait
+        self.scheduler = scheduler
+
+    def stream(self, messages):
+        return self.scheduler.stream(self.session_id, self.chat, messages, self.on_wait)
+
+    def invoke(self, messages):
+        return SimpleNamespace(content="".join(chunk.content for chunk in self.stream(messages)))
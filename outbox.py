@@ -0,0 +1,481 @@
+import hashlib
+import os
+import random
+import smtplib
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import profiler
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", os.path.join(CACHE_DIR, "outbox.sqlite3"))
+
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+RETRY_BASE_DELAY = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "30"))
+RETRY_MAX_DELAY = 3600
+# >0: one mail per category every N minutes instead of one per inquiry
+DIGEST_MINUTES = float(os.getenv("EMAIL_DIGEST_MINUTES", "0"))
+BATCH_SIZE = 50
+# A claimed row is invisible to other workers for this long (covers crashes mid-send)
+LEASE_SECONDS = 300
+POLL_SECONDS = 30
+
+# Same sender + category + message within this window is a duplicate
+DEDUP_MINUTES = float(os.getenv("CONTACT_DEDUP_MINUTES", "10"))
+# Token buckets: (burst, seconds per refilled token)
+SESSION_LIMIT = (int(os.getenv("CONTACT_SESSION_BURST", "3")), float(os.getenv("CONTACT_SESSION_REFILL", "60")))
+# Per-IP bucket is off unless CONTACT_IP_BURST is set: behind a reverse proxy every client
+# shows up as the proxy's address, and users behind one NAT share a bucket
+IP_BURST = int(os.getenv("CONTACT_IP_BURST", "0"))
+IP_LIMIT = (IP_BURST, float(os.getenv("CONTACT_IP_REFILL", "30"))) if IP_BURST > 0 else None
+
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "60"))
+# Reused connections idle longer than this get a NOOP before sending
+SMTP_HEALTHCHECK_SECONDS = 15
+# Reconnect periodically; Gmail caps messages per session
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+
+def smtp_settings():
+    return {
+        "host": os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com"),
+        "port": int(os.getenv("EMAIL_SMTP_PORT", "587")),
+        "starttls": os.getenv("EMAIL_SMTP_STARTTLS", "1") == "1",
+        "sender": os.getenv("EMAIL_SENDER"),
+        "password": os.getenv("EMAIL_PASSWORD"),
+        "receiver": os.getenv("EMAIL_RECEIVER"),
+    }
+
+
+def build_message(settings, name, sender_email, category, message):
+    msg = MIMEMultipart()
+    msg['From'] = settings["sender"]
+    msg['To'] = settings["receiver"]
+    msg['Subject'] = f"[버컵(Burcup) 문의] {category} - {name}님"
+
+    body = f"""
+    버컵(Burcup) 홈페이지를 통해 새로운 문의가 접수되었습니다.
+
+    - 성함/업체명: {name}
+    - 이메일: {sender_email}
+    - 문의유형: {category}
+
+    [상세 내용]
+    {message}
+    """
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def _normalize(text):
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+# (sender key, fingerprint): the sender key ignores the message, the fingerprint includes its hash
+def submission_keys(name, email, category, message):
+    sender = "\x1f".join(_normalize(v) for v in (name, email, category))
+    digest = hashlib.sha256(_normalize(message).encode()).hexdigest()
+    return sender, f"{sender}\x1f{digest}"
+
+
+class TokenBucket:
+    def __init__(self, burst, refill_seconds):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.refill_seconds)
+        self.updated = now
+        return self.tokens
+
+
+# Per-session (and, when ip_limit is set, per-IP) token buckets for the contact form, shared by the process
+class SubmissionLimiter:
+    def __init__(self, session_limit=SESSION_LIMIT, ip_limit=IP_LIMIT, max_clients=10000):
+        self.limits = {"session": session_limit, "ip": ip_limit}
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _bucket(self, kind, client):
+        bucket = self._buckets.get((kind, client))
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                # Forget the oldest client; at worst it gets a fresh burst
+                del self._buckets[next(iter(self._buckets))]
+            bucket = self._buckets[(kind, client)] = TokenBucket(*self.limits[kind])
+        return bucket
+
+    def allow(self, session_id=None, ip=None):
+        with self._lock:
+            buckets = [self._bucket(kind, client) for kind, client in (("session", session_id), ("ip", ip))
+                       if client and self.limits[kind]]
+            # Every bucket needs a token; a rejection doesn't drain the others
+            if any(bucket.refill() < 1 for bucket in buckets):
+                return False
+            for bucket in buckets:
+                bucket.tokens -= 1
+            return True
+
+
+def build_digest(settings, category, rows):
+    msg = MIMEMultipart()
+    msg['From'] = settings["sender"]
+    msg['To'] = settings["receiver"]
+    msg['Subject'] = f"[버컵(Burcup) 문의 요약] {category} {len(rows)}건"
+
+    entries = "\n".join(
+        f"""
+    [{i}] {time.strftime('%Y-%m-%d %H:%M', time.localtime(created))}
+    - 성함/업체명: {name}
+    - 이메일: {email}
+
+    {message}
+    """
+        for i, (_, created, name, email, _, message, _) in enumerate(rows, 1)
+    )
+    body = f"""
+    버컵(Burcup) 홈페이지를 통해 '{category}' 문의 {len(rows)}건이 접수되었습니다.
+    {entries}"""
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+# A warm, authenticated SMTP session reused across deliveries
+class SMTPConnection:
+    def __init__(self, keep_alive=True):
+        self.keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._server = None
+        self._settings = None
+        self._sent = 0
+        self._last_used = 0.0
+        self.stats = {"connections": 0, "messages": 0, "healthchecks": 0, "reconnects": 0}
+
+    def _connect(self, settings):
+        if not settings["sender"] or not settings["receiver"]:
+            raise RuntimeError("이메일 설정이 완료되지 않았습니다. (.env 파일을 확인해주세요)")
+        server = smtplib.SMTP(settings["host"], settings["port"], timeout=30)
+        try:
+            if settings["starttls"]:
+                server.starttls()
+            if settings["password"]:
+                server.login(settings["sender"], settings["password"])
+        except Exception:
+            server.close()
+            raise
+        self._server, self._settings, self._sent = server, settings, 0
+        self.stats["connections"] += 1
+
+    def _close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
+
+    def _healthy(self, settings):
+        if self._server is None or self._settings != settings:
+            return False
+        if self._sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            return False
+        if time.monotonic() - self._last_used > SMTP_HEALTHCHECK_SECONDS:
+            self.stats["healthchecks"] += 1
+            try:
+                return self._server.noop()[0] == 250
+            except Exception:
+                return False
+        return True
+
+    def send(self, settings, msg):
+        with self._lock:
+            start = time.perf_counter()
+            if not self._healthy(settings):
+                self._close()
+                self._connect(settings)
+            try:
+                self._server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the health check and the send: reconnect once
+                self.stats["reconnects"] += 1
+                self._close()
+                self._connect(settings)
+                self._server.send_message(msg)
+            self._sent += 1
+            self._last_used = time.monotonic()
+            self.stats["messages"] += 1
+            # Connect/health check included: that is what a reused connection saves
+            profiler.observe("smtp_send", (time.perf_counter() - start) * 1000)
+            if not self.keep_alive:
+                self._close()
+
+    def close_if_idle(self):
+        with self._lock:
+            if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+                self._close()
+
+
+class Outbox:
+    def __init__(self, path, digest_minutes=DIGEST_MINUTES, keep_alive=True):
+        self.path = path
+        self.digest_minutes = digest_minutes
+        self.smtp = SMTPConnection(keep_alive)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._conn = None
+        self._worker = None
+        self._stats = {"queued": 0, "merged": 0, "duplicates": 0, "throttled": 0}
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS inquiries ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL, name TEXT, email TEXT,"
+                "category TEXT, message TEXT, status TEXT DEFAULT 'pending', attempts INTEGER DEFAULT 0,"
+                "next_attempt REAL, last_error TEXT, sent_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS inquiries_due ON inquiries (status, next_attempt)")
+            # Recent submissions, for duplicate detection and merging
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS submissions ("
+                "fingerprint TEXT, sender TEXT, created REAL, inquiry_id INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS submissions_fingerprint ON submissions (fingerprint, created)")
+            conn.execute("CREATE INDEX IF NOT EXISTS submissions_sender ON submissions (sender, created)")
+            self._conn = conn
+        return self._conn
+
+    # In digest mode inquiries wait for the end of the current window
+    def _first_attempt(self, now):
+        if self.digest_minutes <= 0:
+            return now
+        window = self.digest_minutes * 60
+        return (now // window + 1) * window
+
+    # Durably spool an inquiry; delivery happens on the background worker.
+    # Returns (status, inquiry id): "queued", "merged" into a not-yet-sent inquiry
+    # from the same sender and category, or "duplicate" (dropped)
+    def submit(self, name, email, category, message):
+        now = time.time()
+        sender, fingerprint = submission_keys(name, email, category, message)
+        since = now - DEDUP_MINUTES * 60
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM submissions WHERE created < ?", (since,))
+                row = db.execute(
+                    "SELECT inquiry_id FROM submissions WHERE fingerprint = ? AND created >= ? LIMIT 1",
+                    (fingerprint, since),
+                ).fetchone()
+                if row is not None:
+                    status, inquiry_id = "duplicate", row[0]
+                else:
+                    row = db.execute(
+                        "SELECT i.id FROM submissions s JOIN inquiries i ON i.id = s.inquiry_id"
+                        " WHERE s.sender = ? AND s.created >= ? AND i.status = 'pending'"
+                        " ORDER BY s.created DESC LIMIT 1",
+                        (sender, since),
+                    ).fetchone()
+                    if row is not None:
+                        status, inquiry_id = "merged", row[0]
+                        db.execute(
+                            "UPDATE inquiries SET message = message || ? WHERE id = ?",
+                            (f"\n\n[추가 문의 {time.strftime('%H:%M', time.localtime(now))}]\n{message}", inquiry_id),
+                        )
+                    else:
+                        status = "queued"
+                        inquiry_id = db.execute(
+                            "INSERT INTO inquiries (created, name, email, category, message, next_attempt)"
+                            " VALUES (?, ?, ?, ?, ?, ?)",
+                            (now, name, email, category, message, self._first_attempt(now)),
+                        ).lastrowid
+                    db.execute(
+                        "INSERT INTO submissions (fingerprint, sender, created, inquiry_id) VALUES (?, ?, ?, ?)",
+                        (fingerprint, sender, now, inquiry_id),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self._stats["duplicates" if status == "duplicate" else status] += 1
+        if status == "queued" and self.digest_minutes <= 0:
+            self._wake.set()
+        return status, inquiry_id
+
+    def count_throttled(self):
+        with self._lock:
+            self._stats["throttled"] += 1
+
+    # Lease a batch of due inquiries so concurrent workers (other processes) skip them;
+    # a 'sending' row whose lease ran out (worker died mid-send) is due again. limit=-1: all due
+    def _claim(self, limit=BATCH_SIZE):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = db.execute(
+                    "SELECT id, created, name, email, category, message, attempts FROM inquiries"
+                    " WHERE status IN ('pending', 'sending') AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                db.executemany(
+                    "UPDATE inquiries SET status = 'sending', next_attempt = ? WHERE id = ?",
+                    [(now + LEASE_SECONDS, row[0]) for row in rows],
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _mark_sent(self, rows):
+        now = time.time()
+        with self._lock:
+            self._db().executemany(
+                "UPDATE inquiries SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+                [(now, row[0]) for row in rows],
+            )
+
+    def _mark_failed(self, rows, error):
+        updates = []
+        # One jitter for the whole mail, so a failed digest is retried as one digest
+        jitter = random.uniform(0.5, 1)
+        for row in rows:
+            attempts = row[6] + 1
+            if attempts >= MAX_ATTEMPTS:
+                status, next_attempt = "dead", None
+            else:
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+                status, next_attempt = "pending", time.time() + delay * jitter
+            updates.append((status, attempts, next_attempt, str(error)[:500], row[0]))
+        with self._lock:
+            self._db().executemany(
+                "UPDATE inquiries SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                updates,
+            )
+
+    # Send one mail for the given rows (a single inquiry, or a per-category digest)
+    def deliver(self, rows):
+        settings = smtp_settings()
+        try:
+            if len(rows) == 1:
+                _, _, name, email, category, message, _ = rows[0]
+                msg = build_message(settings, name, email, category, message)
+            else:
+                msg = build_digest(settings, rows[0][4], rows)
+            self.smtp.send(settings, msg)
+        except Exception as e:
+            self._mark_failed(rows, e)
+            return False
+        self._mark_sent(rows)
+        return True
+
+    # Deliver everything currently due; returns the number of inquiries attempted
+    def process_due(self):
+        processed = 0
+        # A digest window is claimed whole: batching it would split a category over several mails
+        limit = -1 if self.digest_minutes > 0 else BATCH_SIZE
+        while rows := self._claim(limit):
+            if self.digest_minutes > 0:
+                groups = {}
+                for row in rows:
+                    groups.setdefault(row[4], []).append(row)
+                batches = list(groups.values())
+            else:
+                batches = [[row] for row in rows]
+            for batch in batches:
+                self.deliver(batch)
+            processed += len(rows)
+        return processed
+
+    def _next_due_in(self):
+        with self._lock:
+            row = self._db().execute(
+                "SELECT MIN(next_attempt) FROM inquiries WHERE status IN ('pending', 'sending')"
+            ).fetchone()
+        if row[0] is None:
+            return POLL_SECONDS
+        return min(POLL_SECONDS, max(0.0, row[0] - time.time()))
+
+    def _run(self):
+        while True:
+            try:
+                self.process_due()
+                self.smtp.close_if_idle()
+                timeout = self._next_due_in()
+            except Exception:
+                # Keep the worker alive through transient SQLite errors
+                timeout = POLL_SECONDS
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    # One daemon worker per process, started on first use
+    def start_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+                self._worker.start()
+
+    def counts(self):
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM inquiries GROUP BY status").fetchall()
+        return dict(rows)
+
+    def stats(self):
+        with self._lock:
+            submissions = dict(self._stats)
+        return dict(self.counts(), submissions=submissions, smtp=dict(self.smtp.stats),
+                    digest_minutes=self.digest_minutes)
+
+    def dead_letters(self):
+        with self._lock:
+            return self._db().execute(
+                "SELECT id, created, name, email, category, attempts, last_error FROM inquiries"
+                " WHERE status = 'dead' ORDER BY id"
+            ).fetchall()
+
+    def retry_dead(self):
+        with self._lock:
+            count = self._db().execute(
+                "UPDATE inquiries SET status = 'pending', attempts = 0, next_attempt = ? WHERE status = 'dead'",
+                (time.time(),),
+            ).rowcount
+        self._wake.set()
+        return count
+
+
+outbox = Outbox(OUTBOX_PATH)
+limiter = SubmissionLimiter()
+
+
+if __name__ == "__main__":
+    # python outbox.py [status | dead | retry-dead | flush]
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "status":
+        print(outbox.counts())
+    elif command == "dead":
+        for row in outbox.dead_letters():
+            print(row)
+    elif command == "retry-dead":
+        print(f"requeued {outbox.retry_dead()} inquiries")
+    elif command == "flush":
+        # Everything pending is due now (digests still group by category)
+        with outbox._lock:
+            outbox._db().execute("UPDATE inquiries SET next_attempt = ? WHERE status = 'pending'", (time.time(),))
+        print(f"attempted {outbox.process_due()} inquiries", outbox.stats())
+    else:
+        sys.exit(f"unknown command: {command}")
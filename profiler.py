@@ -0,0 +1,205 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+PROFILE_LOG = os.getenv("PROFILE_LOG", os.path.join(CACHE_DIR, "profile.jsonl"))
+# Runs kept per session for the sidebar panel, samples kept per latency metric
+HISTORY = 20
+SAMPLES = 500
+
+_lock = threading.Lock()
+_latencies = {}
+_local = threading.local()
+
+
+# Opt-in: BURCUP_PROFILE=1 for every session (and background workers), or ?profile=1 for one browser
+def env_enabled():
+    return os.getenv("BURCUP_PROFILE") == "1"
+
+
+def enabled():
+    import streamlit as st
+    return env_enabled() or st.query_params.get("profile") == "1"
+
+
+def log(record):
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock:
+        os.makedirs(os.path.dirname(PROFILE_LOG), exist_ok=True)
+        with open(PROFILE_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+# Process-wide latency sample (LLM time-to-first-token, SMTP sends from the outbox worker, ...)
+def observe(metric, ms, log_line=None):
+    with _lock:
+        _latencies.setdefault(metric, deque(maxlen=SAMPLES)).append(ms)
+    if log_line is None:
+        log_line = env_enabled()
+    if log_line:
+        log({"ts": round(time.time(), 3), "metric": metric, "ms": round(ms, 2)})
+
+
+def latency_summary():
+    with _lock:
+        samples = {metric: list(values) for metric, values in _latencies.items()}
+    return {
+        metric: {"count": len(values), "p50_ms": round(_percentile(values, 0.5), 1), "p95_ms": round(_percentile(values, 0.95), 1)}
+        for metric, values in samples.items() if values
+    }
+
+
+def _fragment_rerun():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+# Timings of one script run (scope "app") or one fragment rerun.
+# lap() closes the interval since the previous lap, section() times a nested block.
+class Run:
+    def __init__(self, scope):
+        self.scope = scope
+        self.page = None
+        self.started = self._lap = time.perf_counter()
+        self.sections = {}
+        self.latencies = {}
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.sections[name] = round((now - self._lap) * 1000, 2)
+        self._lap = now
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def observe(self, metric, ms):
+        self.latencies[metric] = round(ms, 2)
+        observe(metric, ms, log_line=False)
+
+    def finish(self):
+        import streamlit as st
+        reruns = st.session_state.setdefault("profile_reruns", {})
+        reruns[self.scope] = reruns.get(self.scope, 0) + 1
+        record = {
+            "ts": round(time.time(), 3),
+            "session": st.session_state.get("session_id"),
+            "scope": self.scope,
+            "page": self.page,
+            "rerun": reruns[self.scope],
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "sections": self.sections,
+            "latencies": self.latencies,
+        }
+        st.session_state.setdefault("profile_runs", deque(maxlen=HISTORY)).append(record)
+        log(record)
+        return record
+
+
+# A fragment called during a full run reports into that run
+class _Nested:
+    def __init__(self, run):
+        self._run = run
+
+    def __getattr__(self, name):
+        return getattr(self._run, name)
+
+    def finish(self):
+        pass
+
+
+class _Off:
+    page = None
+
+    def lap(self, name):
+        pass
+
+    def section(self, name):
+        return nullcontext()
+
+    def observe(self, metric, ms):
+        pass
+
+    def finish(self):
+        pass
+
+
+OFF = _Off()
+
+
+# Start timing the full script ("app") or a fragment; a no-op object unless profiling is on
+def begin(scope="app"):
+    if not enabled():
+        return OFF
+    if scope != "app" and not _fragment_rerun():
+        run = getattr(_local, "run", None)
+        return _Nested(run) if run is not None else OFF
+    run = Run(scope)
+    if scope == "app":
+        _local.run = run
+    return run
+
+
+# Collapsible sidebar panel: last run's sections, recent runs, rerun counts, latencies
+def panel(run):
+    if run is OFF:
+        return
+    import streamlit as st
+    with st.sidebar.expander("⏱️ 렌더 프로파일"):
+        runs = list(st.session_state.get("profile_runs", []))
+        if runs:
+            last = runs[-1]
+            st.caption(f"직전 실행: {last['scope']} · {last['page']} · {last['total_ms']} ms")
+            st.dataframe([{"section": k, "ms": v} for k, v in last["sections"].items()], hide_index=True)
+            st.dataframe(
+                [{"scope": r["scope"], "page": r["page"], "ms": r["total_ms"], **r["latencies"]} for r in reversed(runs)],
+                hide_index=True,
+            )
+        st.json({"reruns": st.session_state.get("profile_reruns", {}), "latencies": latency_summary()})
+        st.caption(f"로그: {PROFILE_LOG}")
+
+
+# Offline aggregation of the JSONL log: p50/p95 per scope/page and section
+def summarize(path=PROFILE_LOG):
+    runs, metrics = {}, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if "metric" in record:
+                metrics.setdefault(record["metric"], []).append(record["ms"])
+                continue
+            key = f"{record['scope']}:{record['page']}"
+            runs.setdefault(key, {}).setdefault("total", []).append(record["total_ms"])
+            for name, ms in record["sections"].items():
+                runs[key].setdefault(name, []).append(ms)
+            for name, ms in record["latencies"].items():
+                metrics.setdefault(name, []).append(ms)
+    for key, sections in sorted(runs.items()):
+        print(f"{key}  ({len(sections['total'])} runs)")
+        for name, values in sections.items():
+            print(f"  {name:<28} p50 {_percentile(values, 0.5):8.2f} ms   p95 {_percentile(values, 0.95):8.2f} ms")
+    for name, values in sorted(metrics.items()):
+        print(f"{name:<30} n={len(values):<5} p50 {_percentile(values, 0.5):8.2f} ms   p95 {_percentile(values, 0.95):8.2f} ms")
+
+
+if __name__ == "__main__":
+    # python profiler.py [log path]
+    path = sys.argv[1] if len(sys.argv) > 1 else PROFILE_LOG
+    if not os.path.exists(path):
+        sys.exit(f"no profile log at {path}")
+    summarize(path)
@@ -0,0 +1,200 @@
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from collections import Counter, namedtuple
+
+from content import BASE_DIR, business_store, dumps
+
+CANVAS_PATH = os.path.join(BASE_DIR, "canvas.md")
+TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "8"))
+
+Chunk = namedtuple("Chunk", ["source", "text", "keywords"])
+
+# Korean search terms for business.json keys, so "대표번호" finds contact.phone
+KEY_LABELS = {
+    "company_info": "회사 정보 소개",
+    "ceo": "대표 대표이사",
+    "contact": "연락처 문의",
+    "phone": "전화 전화번호 대표번호",
+    "email": "이메일 메일",
+    "hours": "운영시간 영업시간 상담시간",
+    "location": "위치 주소 본사 공장 소재지 어디",
+    "establishment_date": "설립일 설립",
+    "industry": "업종 사업 분야",
+    "product_info": "제품 버컵 컵홀더",
+    "value_props": "장점 특징 가치",
+    "features": "특징 기능 장점 성능",
+    "impact": "임팩트 효과 수치",
+    "manufacturing_process": "제조 공정 생산 과정 만드는 방법",
+    "swot": "SWOT 강점 약점 기회 위협",
+    "business_model": "비즈니스 모델 사업 모델",
+    "canvas": "비즈니스 캔버스",
+    "equity_info": "지분 지분 구조 주주 주식",
+    "shareholders": "주주 지분율 주식 수",
+    "total_shares": "발행주식 총 주식",
+    "par_value": "액면가",
+    "partnership": "파트너십 협력 제휴",
+    "partners": "파트너 협력 대상",
+    "future_plans": "향후 계획 미래 목표 로드맵",
+    "1_year_goal": "1년 목표 단기",
+    "3_year_goal": "3년 목표 중장기",
+    "marketing_strategy": "마케팅 전략 홍보",
+    "brand_ip": "상표 출원 브랜드 자산 IP",
+    "applicant": "출원인",
+    "schedule": "일정",
+    "milestones": "마일스톤 단계 로드맵",
+}
+
+
+def _keywords(path, item=None):
+    keys = path.split(".")
+    if hasattr(item, "keys"):
+        keys += list(item.keys())
+    return " ".join(KEY_LABELS.get(key, "") for key in keys)
+
+
+_HANGUL = re.compile(r"[가-힣]+")
+_WORD = re.compile(r"[\w%~.-]+")
+
+
+# Korean-aware tokens: whole words plus Hangul character bigrams (particles and
+# endings stay attached to words, so bigrams are what actually match)
+def tokenize(text):
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _WORD.findall(text):
+        word = word.strip(".-")
+        if not word:
+            continue
+        tokens.append(word)
+        for run in _HANGUL.findall(word):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _json_chunks(data):
+    chunks = []
+    for section, value in data.items():
+        if not hasattr(value, "items"):
+            chunks.append(Chunk(section, f"{section}: {value}", _keywords(section)))
+            continue
+        scalars = {k: v for k, v in value.items() if not isinstance(v, (tuple, list)) and not hasattr(v, "items")}
+        if scalars:
+            chunks.append(Chunk(section, f"[{section}] {dumps(scalars, ensure_ascii=False)}", _keywords(section, scalars)))
+        for key, item in value.items():
+            if key in scalars:
+                continue
+            path = f"{section}.{key}"
+            if isinstance(item, (tuple, list)):
+                # One chunk per list entry (feature, step, shareholder, ...)
+                chunks.extend(
+                    Chunk(path, f"[{path}] {dumps(entry, ensure_ascii=False)}", _keywords(path))
+                    for entry in item
+                )
+            elif all(hasattr(v, "items") for v in item.values()):
+                chunks.extend(
+                    Chunk(f"{path}.{sub}", f"[{path}.{sub}] {dumps(entry, ensure_ascii=False)}", _keywords(path))
+                    for sub, entry in item.items()
+                )
+            else:
+                chunks.append(Chunk(path, f"[{path}] {dumps(item, ensure_ascii=False)}", _keywords(path, item)))
+    return chunks
+
+
+def _markdown_chunks(text, source):
+    chunks = []
+    for section in re.split(r"\r?\n(?=## )", text):
+        lines = [line.rstrip() for line in section.strip().splitlines() if line.strip()]
+        if not lines:
+            continue
+        title = lines[0].lstrip("# ").strip()
+        # Numbered canvas items ("1. 고객: ...") become chunks of their own
+        items, current = [], []
+        for line in lines[1:]:
+            if re.match(r"^\d+\.", line) and current:
+                items.append(current)
+                current = []
+            current.append(line.strip())
+        if current:
+            items.append(current)
+        for item in items or [[]]:
+            chunks.append(Chunk(f"{source}#{title}", " ".join([title + ":"] + item), ""))
+    return chunks
+
+
+class BM25Index:
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.doc_tokens = [Counter(tokenize(f"{c.keywords} {c.text}")) for c in chunks]
+        self.doc_len = [sum(tf.values()) for tf in self.doc_tokens]
+        self.avg_len = sum(self.doc_len) / max(len(chunks), 1)
+        df = Counter(term for tf in self.doc_tokens for term in tf)
+        n = len(chunks)
+        self.idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def search(self, query, k=TOP_K):
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        scored = []
+        for i, tf in enumerate(self.doc_tokens):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[i] / self.avg_len)
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    score += self.idf[term] * f * (self.k1 + 1) / (f + norm)
+            if score > 0:
+                scored.append((score, i))
+        scored.sort(reverse=True)
+        return [(self.chunks[i], score) for score, i in scored[:k]]
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def _canvas_key():
+    try:
+        st = os.stat(CANVAS_PATH)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Built once per business.json version / canvas.md revision and shared process-wide
+def get_index(snapshot):
+    key = (snapshot.version, _canvas_key())
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                chunks = _json_chunks(snapshot.data)
+                if key[1] is not None:
+                    with open(CANVAS_PATH, encoding="utf-8") as f:
+                        chunks += _markdown_chunks(f.read(), "canvas.md")
+                index = BM25Index(chunks)
+                _indexes.clear()
+                _indexes[key] = index
+    return index
+
+
+# Context block for the system prompt: company basics plus the top-k chunks for the question
+def build_context(snapshot, question, k=TOP_K):
+    index = get_index(snapshot)
+    selected = [chunk for chunk, _ in index.search(question, k)]
+    basics = index.chunks[0]
+    if basics not in selected:
+        selected.insert(0, basics)
+    return "\n".join(chunk.text for chunk in selected)
+
+
+if __name__ == "__main__":
+    snapshot = business_store.get()
+    question = " ".join(sys.argv[1:]) or "생분해 기간이 얼마나 되나요?"
+    for chunk, score in get_index(snapshot).search(question):
+        print(f"{score:6.2f}  {chunk.text}")
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from chatbot import SYSTEM_PROMPT, ChatContext, StreamRenderer
+from content import business_store
+from llm import FakeChatModel, LLMScheduler, ScheduledChat
+from retrieval import build_context
+
+QUESTIONS = [
+    "버컵이 뭐예요?",
+    "생분해 기간이 얼마나 되나요?",
+    "단열 성능은 어떤가요?",
+    "대량 구매하면 얼마나 걸리나요?",
+    "제조 공정을 설명해 주세요",
+    "대표번호가 뭐야?",
+    "지분 구조 알려줘",
+    "향후 3년 계획이 궁금해요",
+]
+
+
+# Stands in for st.empty(); StreamRenderer counts the frames and bytes
+class NullPlaceholder:
+    def markdown(self, body):
+        pass
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+# One simulated Q&A session, following the same steps as the app's Q&A page
+def run_session(chat, turns, session_id, scheduler=None):
+    if scheduler is not None:
+        chat = ScheduledChat(chat, f"session-{session_id}", scheduler=scheduler)
+    snapshot = business_store.get()
+    context = ChatContext()
+    messages = []
+    results = []
+    for turn in range(turns):
+        question = QUESTIONS[(session_id + turn) % len(QUESTIONS)]
+        messages.append(HumanMessage(content=question))
+        start = time.perf_counter()
+        first = None
+        try:
+            recent = [m.content for m in messages if m.type == "human"][-2:]
+            system_content = SYSTEM_PROMPT.format(context=build_context(snapshot, " ".join(recent)))
+            payload = context.build(chat, system_content, messages)
+            renderer = StreamRenderer(NullPlaceholder())
+            for chunk in chat.stream(payload):
+                if first is None:
+                    first = time.perf_counter()
+                renderer.write(chunk.content)
+            answer = renderer.close()
+        except Exception as e:
+            messages.pop()
+            results.append({"ok": False, "error": type(e).__name__, "total_s": time.perf_counter() - start})
+            continue
+        end = time.perf_counter()
+        messages.append(AIMessage(content=answer))
+        stats = renderer.stats()
+        streaming = end - first
+        results.append({
+            "ok": True,
+            "ttft_s": first - start,
+            "total_s": end - start,
+            "tokens_per_s": stats["chunks"] / streaming if streaming > 0 else None,
+            "frames": stats["frames"],
+            "bytes_sent": stats["bytes_sent"],
+        })
+    return results
+
+
+def summarize(results):
+    ok = [r for r in results if r["ok"]]
+    report = {"turns": len(results), "errors": len(results) - len(ok)}
+    for metric in ("ttft_s", "total_s", "tokens_per_s", "frames", "bytes_sent"):
+        values = [r[metric] for r in ok if r[metric] is not None]
+        report[metric] = {
+            "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Q&A latency benchmark against the fake LLM backend")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=6, help="questions per session")
+    parser.add_argument("--ttft", type=float, default=0.4, help="fake time to first token (s)")
+    parser.add_argument("--tokens-per-sec", type=float, default=60)
+    parser.add_argument("--answer-tokens", type=int, default=120)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-inflight", type=int, default=0,
+                        help="route calls through a scheduler with this cap (0: call the backend directly)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    chat = FakeChatModel(
+        ttft=args.ttft,
+        tokens_per_sec=args.tokens_per_sec,
+        answer_tokens=args.answer_tokens,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    scheduler = LLMScheduler(max_inflight=args.max_inflight) if args.max_inflight else None
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        sessions = list(pool.map(lambda i: run_session(chat, args.turns, i, scheduler), range(args.sessions)))
+    report = summarize([r for session in sessions for r in session])
+    report["wall_s"] = time.perf_counter() - start
+    if scheduler is not None:
+        report["scheduler"] = scheduler.metrics()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"turns={report['turns']} errors={report['errors']} wall={report['wall_s']:.2f}s")
+    for metric in ("ttft_s", "total_s", "tokens_per_s", "frames", "bytes_sent"):
+        values = [report[metric][q] for q in ("p50", "p95")]
+        print(f"{metric:>13}  " + "  ".join(
+            f"{q}={'-' if v is None else round(v, 3)}" for q, v in zip(("p50", "p95"), values)
+        ))
+    if scheduler is not None:
+        print("scheduler", report["scheduler"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts
+import fragments
+from content import business_store
+
+
+# Same steps st.plotly_chart takes to turn a figure into the spec it sends
+def plotly_spec(figure):
+    import plotly.io as pio
+    import plotly.tools
+    return pio.to_json(plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True), validate=False)
+
+
+def time_ms(render, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        payload = render()
+    return (time.perf_counter() - start) / repeat * 1000, payload
+
+
+# Plotly's JS chunk in the installed Streamlit frontend (downloaded once per browser cache)
+def plotly_bundle_bytes():
+    import streamlit
+    paths = glob.glob(os.path.join(os.path.dirname(streamlit.__file__), "static", "static", "js", "PlotlyChart.*.js"))
+    if not paths:
+        return None, None
+    with open(paths[0], "rb") as f:
+        data = f.read()
+    return len(data), len(gzip.compress(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equity page chart: render time and payload per mode")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    snapshot = business_store.get()
+    table = fragments.equity_table(snapshot)
+    start = time.perf_counter()
+    import plotly.graph_objects  # noqa: F401
+    import_ms = (time.perf_counter() - start) * 1000
+
+    modes = {
+        # Old behaviour: a new figure every rerun
+        "rebuild": lambda: plotly_spec(charts.equity_figure.uncached(snapshot)),
+        "cached": lambda: plotly_spec(charts.equity_figure(snapshot)),
+        "lite": lambda: charts.equity_donut_svg(snapshot),
+    }
+    rows = []
+    for mode, render in modes.items():
+        render()
+        ms, payload = time_ms(render, args.repeat)
+        body = (payload + table).encode()
+        rows.append({
+            "mode": mode,
+            "render_ms": round(ms, 3),
+            "payload_bytes": len(body),
+            "payload_gzip_bytes": len(gzip.compress(body)),
+        })
+    bundle, bundle_gzip = plotly_bundle_bytes()
+    report = {
+        "plotly_import_ms": round(import_ms, 1),
+        "plotly_js_bytes": bundle,
+        "plotly_js_gzip_bytes": bundle_gzip,
+        "modes": rows,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for r in rows:
+        print(f"{r['mode']:>8}  {r['render_ms']:8.3f} ms/rerun  "
+              f"{r['payload_bytes']:6d} B ({r['payload_gzip_bytes']} B gzip) chart + table")
+    print(f"plotly import {report['plotly_import_ms']} ms (first render only); "
+          f"Plotly JS bundle {bundle} B ({bundle_gzip} B gzip), not loaded in lite mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from unittest import mock
+from urllib import parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# The chat panel needs a backend; the fake one keeps the LLM out of the measurement
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+
+STOPPED = (ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS, ScriptRunnerEvent.FRAGMENT_STOPPED_WITH_SUCCESS)
+# Fast-path questions (answered from business.json) so every turn measures script time, not the model
+QUESTIONS = ["연락처 알려주세요", "대표번호가 뭔가요?", "이메일 주소 알려주세요"]
+
+
+# LocalScriptRunner.run that times the script body itself (SCRIPT_STARTED -> stopped),
+# optionally scoped to one fragment like the browser's rerun after a fragment widget event
+def timed_run(timings, fragment_id=None):
+    def run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        def on_event(sender, event, **kwargs):
+            if event == ScriptRunnerEvent.SCRIPT_STARTED:
+                timings.append(-time.perf_counter())
+            elif event in STOPPED:
+                timings[-1] = (timings[-1] + time.perf_counter()) * 1000
+
+        self.on_event.connect(on_event, weak=False)
+        if fragment_id:
+            # A new runner starts with a full-rerun request queued, which would absorb the scoped one
+            self._requests = ScriptRequests()
+        self.request_rerun(RerunData(widget_states=widget_state, page_script_hash=page_hash,
+                                     query_string=parse.urlencode(query_params or {}, doseq=True),
+                                     fragment_id_queue=[fragment_id] if fragment_id else []))
+        try:
+            if not self._script_thread:
+                self.start()
+            require_widgets_deltas(self, timeout)
+        finally:
+            self.join()
+        return parse_tree_from_messages(self.forward_msgs())
+    return run
+
+
+def open_page(page):
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    # Each interactive page registers exactly one fragment
+    fragment_id, = at._fragment_storage._fragments
+    return at, fragment_id
+
+
+def chat_turn(at, i):
+    at.chat_input[0].set_value(QUESTIONS[i % len(QUESTIONS)])
+
+
+def form_submit(at, i):
+    at.text_input[0].input(f"벤치마크 {i}")
+    at.text_input[1].input(f"bench{i}@example.com")
+    at.text_area[0].input(f"벤치마크 문의 {i}")
+    at.button[0].click()
+
+
+INTERACTIONS = {"Q&A": chat_turn, "파트너십": form_submit}
+
+
+# Median script time of one interaction's rerun, full script vs. fragment only
+def measure(page, interact, scoped, repeat):
+    timings = []
+    # One compiled app.py for all runs, as on a server (AppTest recompiles it every run)
+    script_cache = ScriptCache()
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page), \
+            mock.patch("streamlit.testing.v1.local_script_runner.ScriptCache", lambda: script_cache):
+        at, fragment_id = open_page(page)
+        with mock.patch.object(LocalScriptRunner, "run", timed_run(timings, fragment_id if scoped else None)):
+            for i in range(repeat):
+                interact(at, i)
+                at.run()
+                if at.exception:
+                    raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return round(statistics.median(timings), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Script time per chat turn / form submit: full rerun vs. fragment rerun")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    # Contact submissions are spooled and every run is tracked; keep them out of the real outbox and analytics
+    os.environ.setdefault("OUTBOX_PATH", os.path.join(ROOT, ".cache", "bench-outbox.sqlite3"))
+    os.environ.setdefault("ANALYTICS_PATH", os.path.join(ROOT, ".cache", "bench-analytics.sqlite3"))
+    for name in ("CONTACT_SESSION_BURST", "CONTACT_IP_BURST"):
+        os.environ.setdefault(name, str(args.repeat * 2))
+    report = {}
+    for page, interact in INTERACTIONS.items():
+        full = measure(page, interact, False, args.repeat)
+        fragment = measure(page, interact, True, args.repeat)
+        report[page] = {"full_ms": full, "fragment_ms": fragment, "saved_pct": round((1 - fragment / full) * 100, 1)}
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for page, row in report.items():
+        print(f"{page:>6}  full rerun {row['full_ms']:7.2f} ms   fragment rerun {row['fragment_ms']:7.2f} ms   "
+              f"{-row['saved_pct']:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
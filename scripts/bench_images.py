@@ -0,0 +1,300 @@
+import argparse
+import atexit
+import html
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# page_images() imports the app in-process; benchmark visits must not land in the
+# real analytics, outbox or chat history
+STATE_DIR = tempfile.mkdtemp(prefix="bench-images-")
+atexit.register(shutil.rmtree, STATE_DIR, True)
+os.environ.update({
+    "ANALYTICS_PATH": os.path.join(STATE_DIR, "analytics.sqlite3"),
+    "OUTBOX_PATH": os.path.join(STATE_DIR, "outbox.sqlite3"),
+    "CHAT_HISTORY_PATH": os.path.join(STATE_DIR, "chat_history.sqlite3"),
+})
+
+from PIL import Image
+
+from assets import DERIVED_DIR
+
+PAGES = ["홈", "제품 소개"]
+# (CSS width, height, device pixel ratio)
+VIEWPORTS = {"desktop": (1440, 900, 1), "mobile": (390, 844, 3)}
+IMAGE_MARKER = "<!--bench-image:"
+IMG_RE = re.compile(r"<img\s[^>]*>")
+# <picture>: Chromium takes the first <source> (AVIF when generated), else the <img>
+SOURCE_RE = re.compile(r"<source\s[^>]*>")
+ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+METRICS = ("eager_kb", "lcp_ms", "image_kb", "total_kb")
+
+
+# --- Estimate from the rendered page (no browser) ---
+
+# Coarse layout, to tell which images start inside the first viewport: Streamlit's wide layout
+# with the sidebar open above COLUMNS_STACK_PX, columns stacked and no sidebar at or below it
+COLUMNS_STACK_PX = 640
+SIDEBAR_PX = 336
+PADDING_PX = {"top": 96, "desktop": 80, "mobile": 16}
+GAP_PX = 16
+LINE_PX = 26
+# Average glyph width of mixed Korean/Latin body text
+CHAR_PX = 14
+# Cards (value props, features, ...) add padding around their text
+CARD_PX = 48
+FIXED_PX = {"title": 70, "caption": 30, "divider": 50, "tab_bar": 48, "other": 40}
+ASPECT_RE = re.compile(r"aspect-ratio:\s*(\d+)\s*/\s*(\d+)")
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def main_width(viewport_width):
+    if viewport_width <= COLUMNS_STACK_PX:
+        return viewport_width - 2 * PADDING_PX["mobile"]
+    return viewport_width - SIDEBAR_PX - 2 * PADDING_PX["desktop"]
+
+
+def text_height(body, width):
+    text = html.unescape(TAG_RE.sub("\n", body))
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    per_line = max(1, int(width // CHAR_PX))
+    height = sum(-(-len(line) // per_line) for line in lines) * LINE_PX
+    return height + (CARD_PX if body.lstrip().startswith("<div") else 0)
+
+
+def parse_images(body):
+    if body.startswith(IMAGE_MARKER):
+        path = body[len(IMAGE_MARKER):-len("-->")]
+        with Image.open(path) as img:
+            aspect = img.height / img.width
+        return [{"candidates": [(path, None)], "sizes": None, "loading": "eager", "placeholder": 0,
+                 "aspect": aspect}]
+    images = []
+    for tag in IMG_RE.findall(body):
+        attrs = {k: html.unescape(v) for k, v in ATTR_RE.findall(tag)}
+        source = SOURCE_RE.search(body)
+        if source:
+            attrs.update((k, html.unescape(v)) for k, v in ATTR_RE.findall(source.group(0)) if k == "srcset")
+        candidates = [(url, int(w[:-1])) for url, w in (c.split() for c in attrs["srcset"].split(", "))] \
+            if "srcset" in attrs else [(attrs["src"], None)]
+        placeholder = re.search(r"url\((data:[^)]*)\)", body)
+        ratio = ASPECT_RE.search(body)
+        aspect = int(ratio.group(2)) / int(ratio.group(1)) if ratio else \
+            int(attrs.get("height", 1)) / int(attrs.get("width", 1))
+        images.append({"candidates": candidates, "sizes": attrs.get("sizes"),
+                       "loading": attrs.get("loading", "eager"),
+                       "placeholder": len(placeholder.group(1)) if placeholder else 0, "aspect": aspect})
+    return images
+
+
+# Lays out a node at y (None: hidden, e.g. a tab that isn't open), appending its images with
+# their top edge; returns the node's height. stacked: columns go one under another (mobile)
+def layout(node, width, y, images, stacked):
+    kind = node.type
+    if kind == "markdown":
+        found = parse_images(node.value)
+        for image in found:
+            image["top"] = y
+        images.extend(found)
+        if found:
+            return width * found[0]["aspect"]
+        return text_height(node.value, width) if node.value else 0
+    if kind in FIXED_PX:
+        return FIXED_PX[kind]
+    children = list(getattr(node, "children", {}).values())
+    if kind == "tab_container":
+        # Only the first tab is open on load
+        heights = [layout(tab, width, None if i or y is None else y + FIXED_PX["tab_bar"], images, stacked)
+                   for i, tab in enumerate(children)]
+        return FIXED_PX["tab_bar"] + (heights[0] if heights else 0)
+    if children and not stacked and all(c.type == "column" for c in children):
+        weights = [c.proto.weight or 1 for c in children]
+        free = width - GAP_PX * (len(children) - 1)
+        return max(layout(c, free * w / sum(weights), y, images, stacked) for c, w in zip(children, weights))
+    if not hasattr(node, "children"):
+        return FIXED_PX["other"]
+    # Stacked: block, column, tab, or columns on a narrow screen
+    height = 0
+    for child in children:
+        child_height = layout(child, width, None if y is None else y + height, images, stacked)
+        height += child_height + (GAP_PX if child_height else 0)
+    return height
+
+
+# Every image a page renders: st.image calls (one fixed file, fetched on load) and <img> tags,
+# with the top edge (CSS px) of each per viewport
+def page_images(page):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    def record_image(image, *args, **kwargs):
+        st.markdown(f"{IMAGE_MARKER}{image}-->", unsafe_allow_html=True)
+
+    # From the repo root, so .streamlit/config.toml (static serving) applies as on the server
+    os.chdir(ROOT)
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page), \
+            mock.patch("streamlit.image", record_image):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    images = None
+    for viewport, (width, _, _) in VIEWPORTS.items():
+        placed = []
+        # Sidebar images (the logo) load with the page even while the sidebar is collapsed
+        stacked = width <= COLUMNS_STACK_PX
+        layout(at.sidebar, SIDEBAR_PX, 0, placed, stacked)
+        layout(at.main, main_width(width), PADDING_PX["top"], placed, stacked)
+        if images is None:
+            images = [dict(image, top={}) for image in placed]
+        for image, position in zip(images, placed):
+            image["top"][viewport] = position["top"]
+    return images
+
+
+# Slot width (CSS px) from a sizes attribute like "(max-width: 640px) 100vw, 55vw"
+def slot_width(sizes, viewport_width):
+    for entry in sizes.split(","):
+        condition = re.match(r"\s*\(max-width:\s*(\d+)px\)\s*(.*)", entry)
+        if condition and viewport_width > int(condition.group(1)):
+            continue
+        value = (condition.group(2) if condition else entry).strip()
+        return viewport_width * float(value[:-2]) / 100 if value.endswith("vw") else float(value[:-2])
+    return viewport_width
+
+
+# The file a browser would fetch: smallest srcset width covering slot x DPR
+def chosen_file(image, viewport_width, dpr):
+    candidates = image["candidates"]
+    if image["sizes"] and candidates[0][1]:
+        need = slot_width(image["sizes"], viewport_width) * dpr
+        url = next((url for url, w in candidates if w >= need), candidates[-1][0])
+    else:
+        url = candidates[-1][0]
+    return os.path.join(DERIVED_DIR, os.path.basename(url))
+
+
+# Eager images are fetched with the page. A lazy one is deferred only if it starts below the
+# first viewport (or sits in a closed tab); one inside it is fetched right away all the same
+def estimate(pages):
+    report = {}
+    for page in pages:
+        images = page_images(page)
+        for viewport, (width, height, dpr) in VIEWPORTS.items():
+            row = {"eager_kb": 0.0, "deferred_kb": 0.0, "placeholder_bytes": 0}
+            for image in images:
+                kb = os.path.getsize(chosen_file(image, width, dpr)) / 1024
+                top = image["top"][viewport]
+                deferred = image["loading"] == "lazy" and (top is None or top >= height)
+                row["deferred_kb" if deferred else "eager_kb"] += kb
+                row["placeholder_bytes"] += image["placeholder"]
+            report[f"{page}/{viewport}"] = {k: round(v, 1) for k, v in row.items()}
+    return report
+
+
+# --- Headless Chromium (pip install playwright && playwright install chromium) ---
+
+LCP_JS = """() => new Promise(resolve => {
+    let lcp = 0;
+    new PerformanceObserver(list => { for (const e of list.getEntries()) lcp = e.startTime; })
+        .observe({type: "largest-contentful-paint", buffered: true});
+    setTimeout(() => resolve(lcp), 1000);
+})"""
+
+
+# LCP and bytes transferred on a first (cold cache) view, without scrolling
+def browser(pages, base):
+    from urllib.parse import quote
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        sys.exit("--browser needs playwright: pip install playwright && playwright install chromium")
+
+    report = {}
+    with sync_playwright() as pw:
+        chromium = pw.chromium.launch()
+        for page_name in pages:
+            for viewport, (width, height, dpr) in VIEWPORTS.items():
+                context = chromium.new_context(viewport={"width": width, "height": height}, device_scale_factor=dpr)
+                page = context.new_page()
+                requests = []
+                page.on("requestfinished", requests.append)
+                page.goto(f"{base}/?page={quote(page_name)}", wait_until="networkidle")
+                page.wait_for_selector("[data-testid='stMarkdown']")
+                page.wait_for_load_state("networkidle")
+                lcp = page.evaluate(LCP_JS)
+                total = images = 0
+                for request in requests:
+                    sizes = request.sizes()
+                    size = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+                    total += size
+                    if request.resource_type == "image":
+                        images += size
+                report[f"{page_name}/{viewport}"] = {"lcp_ms": round(lcp), "image_kb": round(images / 1024, 1),
+                                                     "total_kb": round(total / 1024, 1)}
+                context.close()
+        chromium.close()
+    return report
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for key, row in report.items():
+        for metric in METRICS:
+            old = baseline.get(key, {}).get(metric)
+            if old and row.get(metric) is not None and row[metric] > old * (1 + threshold):
+                regressions.append(f"{key}/{metric}: {old} -> {row[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First-view image cost per page: fetched vs. deferred bytes, or LCP in Chromium")
+    parser.add_argument("--page", action="append", choices=PAGES, help="only these pages (repeatable)")
+    parser.add_argument("--browser", action="store_true", help="measure LCP and transferred bytes in headless Chromium")
+    parser.add_argument("--url", help="with --browser: existing app (default: launch one locally)")
+    parser.add_argument("--port", type=int, default=8598, help="port for the launched app")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed relative increase before flagging (default 0.1)")
+    args = parser.parse_args()
+    pages = args.page or PAGES
+
+    if not args.browser:
+        report = estimate(pages)
+    elif args.url:
+        report = browser(pages, args.url.rstrip("/"))
+    else:
+        from load_test import launch_server
+        with tempfile.TemporaryDirectory() as workdir:
+            proc = launch_server(args.port, workdir)
+            try:
+                report = browser(pages, f"http://127.0.0.1:{args.port}")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    for key, row in report.items():
+        print(f"{key:<18} " + "  ".join(f"{k} {v}" for k, v in row.items()))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
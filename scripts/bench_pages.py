@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rerun_bytes import PAGES, tree_stats
+
+METRICS = ("wall_ms", "peak_kb", "heap_kb", "bytes", "elements")
+
+
+# Stubs for the pages that talk to the outside: fake streaming LLM, local SMTP sink, throwaway outbox
+def stub_environment(workdir):
+    import smtp_sink
+    sink = smtp_sink.start()
+    os.environ.update({
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_TTFT": "0",
+        "FAKE_LLM_TOKENS_PER_SEC": "100000",
+        "OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite3"),
+        "ANALYTICS_PATH": os.path.join(workdir, "analytics.sqlite3"),
+        "EMAIL_SMTP_HOST": "127.0.0.1",
+        "EMAIL_SMTP_PORT": str(sink.server_address[1]),
+        "EMAIL_SMTP_STARTTLS": "0",
+        "EMAIL_SENDER": "bench@example.com",
+        "EMAIL_RECEIVER": "inbox@example.com",
+        "CONTACT_SESSION_BURST": "1000",
+        "CONTACT_IP_BURST": "1000",
+    })
+
+
+# A question per turn that misses the fast path and the answer cache, so the stubbed model answers
+def chat_turn(at, i):
+    at.chat_input[0].set_value(f"버컵 제품의 특징을 설명해 주세요 ({os.getpid()}-{i})")
+
+
+def form_submit(at, i):
+    at.text_input[0].input(f"벤치마크 {i}")
+    at.text_input[1].input(f"bench{os.getpid()}-{i}@example.com")
+    at.text_area[0].input(f"벤치마크 문의 {i}")
+    at.button[0].click()
+
+
+INTERACTIONS = {"Q&A": chat_turn, "파트너십": form_submit}
+
+
+# peak_kb: allocated above the pre-run heap while the script ran; heap_kb: traced heap left afterwards
+def timed_run(at, trace):
+    if trace:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    at.run()
+    wall_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    row = {"wall_ms": round(wall_ms, 2), **tree_stats(at._tree)}
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        row["peak_kb"] = round((peak - before) / 1024, 1)
+        row["heap_kb"] = round(current / 1024, 1)
+    return row
+
+
+def summarize(rows):
+    return {key: statistics.median(r[key] for r in rows) if key == "wall_ms" else max(r[key] for r in rows)
+            for key in rows[0]}
+
+
+# One page in this (fresh) process: the cold first run, warm reruns, and the page's interaction
+def measure_page(page, warm, trace):
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest
+
+    # app.py compiled once, as on a server (AppTest recompiles it every run)
+    script_cache = ScriptCache()
+    if trace:
+        tracemalloc.start()
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page), \
+            mock.patch("streamlit.testing.v1.local_script_runner.ScriptCache", lambda: script_cache):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        report = {"cold": timed_run(at, trace)}
+        report["warm"] = summarize([timed_run(at, trace) for _ in range(warm)])
+        interact = INTERACTIONS.get(page)
+        if interact:
+            rows = []
+            for i in range(warm):
+                interact(at, i)
+                rows.append(timed_run(at, trace))
+            report["interaction"] = summarize(rows)
+    return report
+
+
+# Timings without tracemalloc (it slows allocation-heavy code), memory from a second traced process
+def run_worker(page, warm, trace):
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", page, "--warm", str(warm)]
+    if trace:
+        cmd.append("--trace")
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"{page}: {proc.stderr.strip().splitlines()[-1]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# Wall times are the median over `repeat` processes (a cold run happens once per process)
+def run(pages, warm, repeat):
+    report = {"python": sys.version.split()[0], "warm_runs": warm, "repeat": repeat, "pages": {}}
+    for page in pages:
+        timings = [run_worker(page, warm, False) for _ in range(repeat)]
+        memory = run_worker(page, warm, True)
+        timing = timings[0]
+        for phase, row in timing.items():
+            row["wall_ms"] = statistics.median(t[phase]["wall_ms"] for t in timings)
+            row["peak_kb"] = memory[phase]["peak_kb"]
+            row["heap_kb"] = memory[phase]["heap_kb"]
+        report["pages"][page] = timing
+    return report
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for page, phases in report["pages"].items():
+        for phase, row in phases.items():
+            old_row = baseline.get("pages", {}).get(page, {}).get(phase, {})
+            for key in METRICS:
+                old = old_row.get(key)
+                if old and row[key] > old * (1 + threshold):
+                    regressions.append(f"{page}/{phase}/{key}: {old} -> {row[key]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-page rerun benchmark (cold/warm wall time, peak memory, elements/bytes)")
+    parser.add_argument("--page", action="append", choices=PAGES, help="only these pages (repeatable)")
+    parser.add_argument("--warm", type=int, default=5, help="warm reruns (and interactions) per page")
+    parser.add_argument("--repeat", type=int, default=3, help="processes per page for the wall-time median")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative increase before flagging (default 0.25)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with tempfile.TemporaryDirectory() as workdir:
+            stub_environment(workdir)
+            print(json.dumps(measure_page(args.worker, args.warm, args.trace), ensure_ascii=False))
+        return
+
+    report = run(args.page or PAGES, args.warm, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    for page, phases in report["pages"].items():
+        for phase, row in phases.items():
+            print(f"{page:>8} {phase:<11} {row['wall_ms']:8.2f} ms  {row['peak_kb']:8.1f} KB peak  {row['heap_kb']:8.1f} KB heap  "
+                  f"{row['elements']:3d} elements  {row['bytes']:7d} B")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import retrieval
+from chatbot import count_tokens
+from content import business_store, dumps
+
+QUESTIONS = [
+    "버컵 가격이 얼마예요?",
+    "생분해 기간이 얼마나 되나요?",
+    "대표번호가 뭐야?",
+    "지분 구조 알려줘",
+    "공장 위치가 어디예요?",
+    "제조 공정을 설명해 주세요",
+    "단열 성능은 어떤가요?",
+    "향후 3년 계획이 궁금해요",
+    "카페 점주인데 어떻게 협력할 수 있나요?",
+    "SWOT 분석 결과는?",
+]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt size: full business.json dump vs. top-k retrieval")
+    parser.add_argument("--k", type=int, default=retrieval.TOP_K)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    snapshot = business_store.get()
+    full_context = dumps(snapshot.data, ensure_ascii=False, indent=2)
+
+    start = time.perf_counter()
+    retrieval.BM25Index(retrieval.get_index(snapshot).chunks)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rows = []
+    for question in QUESTIONS:
+        # Full dump: serialize every turn, as the app used to
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            dumps(snapshot.data, ensure_ascii=False, indent=2)
+        full_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            context = retrieval.build_context(snapshot, question, args.k)
+        topk_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+        rows.append({
+            "question": question,
+            "full_tokens": count_tokens(full_context),
+            "topk_tokens": count_tokens(context),
+            "full_us": round(full_us, 1),
+            "topk_us": round(topk_us, 1),
+        })
+
+    full = [r["full_tokens"] for r in rows]
+    topk = [r["topk_tokens"] for r in rows]
+    report = {
+        "chunks": len(retrieval.get_index(snapshot).chunks),
+        "index_build_ms": round(build_ms, 2),
+        "full_tokens_p50": percentile(full, 0.5),
+        "topk_tokens_p50": percentile(topk, 0.5),
+        "topk_tokens_p95": percentile(topk, 0.95),
+        "token_reduction": round(1 - statistics.mean(topk) / statistics.mean(full), 3),
+        "questions": rows,
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for r in rows:
+        print(f"{r['full_tokens']:6d} -> {r['topk_tokens']:5d} tokens  "
+              f"{r['full_us']:8.1f} / {r['topk_us']:7.1f} us  {r['question']}")
+    print(f"chunks={report['chunks']} index_build={report['index_build_ms']} ms "
+          f"p50 {report['full_tokens_p50']} -> {report['topk_tokens_p50']} tokens "
+          f"(-{report['token_reduction']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import smtp_sink
+from outbox import Outbox
+
+CATEGORIES = ["샘플 신청", "대량 구매 문의", "농가 협력 제안", "투자 문의", "기타 문의"]
+
+
+# Spool `count` inquiries into a fresh outbox and time how long the worker takes to drain them
+def run_mode(mode, sink, count, digest_wait):
+    sink.messages.clear()
+    sink.connections = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        box = Outbox(
+            os.path.join(tmp, "outbox.sqlite3"),
+            digest_minutes=digest_wait / 60 if mode == "digest" else 0,
+            keep_alive=mode != "per-message",
+        )
+        for i in range(count):
+            # Campaign-style burst: mostly samples and bulk orders
+            category = CATEGORIES[0] if i % 3 else CATEGORIES[i % len(CATEGORIES)]
+            box.submit(f"고객{i}", f"user{i}@example.com", category, f"문의 내용 {i}")
+        if mode == "digest":
+            time.sleep(digest_wait)
+        start = time.perf_counter()
+        box.process_due()
+        elapsed = time.perf_counter() - start
+        counts = box.counts()
+        box.smtp.close_if_idle()
+    return {
+        "mode": mode,
+        "inquiries": count,
+        "delivered": counts.get("sent", 0),
+        "mails": len(sink.messages),
+        "connections": sink.connections,
+        "drain_s": round(elapsed, 3),
+        "inquiries_per_s": round(count / elapsed, 1) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inquiry delivery throughput against a local SMTP sink")
+    parser.add_argument("--count", type=int, default=100, help="inquiries per mode")
+    parser.add_argument("--connect-delay", type=float, default=0.15,
+                        help="simulated connect + STARTTLS + login cost per connection (s)")
+    parser.add_argument("--delay", type=float, default=0.01, help="simulated per-message latency (s)")
+    parser.add_argument("--digest-wait", type=float, default=1.0, help="digest window used in the benchmark (s)")
+    parser.add_argument("--modes", default="per-message,pooled,digest")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    sink = smtp_sink.start(delay=args.delay, connect_delay=args.connect_delay)
+    os.environ.update(
+        EMAIL_SMTP_HOST="127.0.0.1",
+        EMAIL_SMTP_PORT=str(sink.server_address[1]),
+        EMAIL_SMTP_STARTTLS="0",
+        EMAIL_SENDER=os.getenv("EMAIL_SENDER") or "bench@example.com",
+        EMAIL_RECEIVER=os.getenv("EMAIL_RECEIVER") or "inbox@example.com",
+        EMAIL_PASSWORD="bench",
+    )
+    rows = [run_mode(mode, sink, args.count, args.digest_wait) for mode in args.modes.split(",")]
+    sink.shutdown()
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    for r in rows:
+        print(f"{r['mode']:>12}  {r['delivered']:4d}/{r['inquiries']} delivered in {r['mails']:4d} mails "
+              f"over {r['connections']:3d} connections  {r['drain_s']:7.3f}s  {r['inquiries_per_s']} inquiries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import argparse
+import atexit
+import html
+import os
+import re
+import shutil
+import sys
+import tempfile
+import textwrap
+from unittest import mock
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Pages are rendered through AppTest in this process, which logs a page view per run;
+# send the app's analytics, outbox and chat history to a throwaway directory, not .cache
+STATE_DIR = tempfile.mkdtemp(prefix="export-static-")
+atexit.register(shutil.rmtree, STATE_DIR, True)
+os.environ.update({
+    "ANALYTICS_PATH": os.path.join(STATE_DIR, "analytics.sqlite3"),
+    "OUTBOX_PATH": os.path.join(STATE_DIR, "outbox.sqlite3"),
+    "CHAT_HISTORY_PATH": os.path.join(STATE_DIR, "chat_history.sqlite3"),
+})
+
+import streamlit as st
+from streamlit.proto.GapSize_pb2 import GapSize
+from streamlit.testing.v1 import AppTest
+
+from assets import DERIVED_DIR, STATIC_URL, image_path
+from theme import STYLESHEET
+
+# Read-only pages and their file names; Q&A and 파트너십 stay on the live app
+PAGES = {
+    "홈": "index.html",
+    "제품 소개": "product.html",
+    "비즈니스 모델": "business-model.html",
+    "지분 정보": "equity.html",
+    "향후 계획": "roadmap.html",
+}
+LIVE_PAGES = ["Q&A", "파트너십"]
+ICONS = {"홈": "🏠", "제품 소개": "📦", "비즈니스 모델": "💼", "지분 정보": "📊", "향후 계획": "📅", "Q&A": "❓", "파트너십": "✉️"}
+GAPS = {"SMALL": "1rem", "MEDIUM": "2rem", "LARGE": "4rem"}
+IMAGE_MARKER = "<!--export-image:"
+# Responsive images (assets.image_html) point at the app's static/img
+STATIC_IMAGE_RE = re.compile(re.escape(STATIC_URL) + r"([\w.-]+)")
+
+SITE_CSS = """
+* { box-sizing: border-box; }
+body { margin: 0; display: flex; min-height: 100vh; color: #31333F; background: #fff;
+       font-family: "Source Sans Pro", Pretendard, -apple-system, "Apple SD Gothic Neo", sans-serif; line-height: 1.6; }
+img { max-width: 100%; height: auto; }
+.sidebar { width: 260px; flex-shrink: 0; padding: 1.5rem 1rem; background: #F0F2F6; }
+.sidebar nav a { display: block; padding: 0.6rem 0.8rem; margin: 0.2rem 0; border-radius: 8px; color: inherit; text-decoration: none; }
+.sidebar nav a:hover { background: rgba(128, 128, 128, 0.2); }
+.sidebar nav a.active { background: #2E7D32; color: #fff; }
+.main { flex: 1; min-width: 0; max-width: 1200px; margin: 0 auto; padding: 3rem 2rem; }
+.row { display: flex; }
+.col { min-width: 0; }
+.spacer { height: 1rem; }
+.caption { font-size: 0.875rem; opacity: 0.6; }
+hr { border: none; border-top: 1px solid rgba(49, 51, 63, 0.2); margin: 2rem 0; }
+.tabs > input { display: none; }
+.tabs > label { display: inline-block; padding: 10px 16px; margin-right: 10px; cursor: pointer;
+                background-color: rgba(46, 125, 50, 0.05); border-radius: 10px 10px 0 0; border: 1px solid rgba(46, 125, 50, 0.1); }
+.tabs > .tab-panel { display: none; padding-top: 1rem; }
+/* tab rules */
+@media (max-width: 640px) {
+    body { flex-direction: column; }
+    .sidebar { width: auto; }
+    .row { flex-direction: column; }
+}
+"""
+
+
+def tab_rules(count=8):
+    rules = []
+    for i in range(1, count + 1):
+        rules.append(f".tabs > input:nth-of-type({i}):checked ~ .tab-panel:nth-of-type({i}) {{ display: block; }}")
+        rules.append(f".tabs > input:nth-of-type({i}):checked + label {{ background-color: rgba(46, 125, 50, 0.2); border-bottom: 3px solid #2E7D32; }}")
+    return "\n".join(rules)
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    return re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+
+
+# The small Markdown subset the pages use: headings, rules, bullet lists, bold, paragraphs.
+# Bodies that are HTML (unsafe_allow_html) pass through untouched.
+def markdown_to_html(body):
+    body = textwrap.dedent(body).strip()
+    if not body:
+        return '<div class="spacer"></div>'
+    if body.startswith("<"):
+        return body
+    out, items, para = [], [], []
+
+    def flush():
+        if items:
+            out.append("<ul>" + "".join(f"<li>{_inline(i)}</li>" for i in items) + "</ul>")
+            items.clear()
+        if para:
+            out.append(f"<p>{_inline(' '.join(para))}</p>")
+            para.clear()
+
+    for line in body.splitlines():
+        line = line.strip()
+        heading = re.match(r"(#{1,6})\s+(.*)", line)
+        if not line:
+            flush()
+        elif line in ("---", "***"):
+            flush()
+            out.append("<hr>")
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif line.startswith(("- ", "* ")):
+            items.append(line[2:])
+        else:
+            para.append(line)
+    flush()
+    return "\n".join(out)
+
+
+class Renderer:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.tab_groups = 0
+        self.images = {}
+        self.unsupported = []
+
+    # Copy an image derivative into the bundle once; returns its URL relative to the pages
+    def image(self, path):
+        name = self.images.get(path)
+        if name is None:
+            name = self.images[path] = "img/" + os.path.basename(path)
+            os.makedirs(os.path.join(self.out_dir, "img"), exist_ok=True)
+            shutil.copyfile(path, os.path.join(self.out_dir, name))
+        return name
+
+    def children(self, node):
+        return "\n".join(filter(None, (self.node(child) for child in node.children.values())))
+
+    def node(self, node):
+        kind = node.type
+        proto = getattr(node, "proto", None)
+        if kind == "markdown":
+            body = proto.body
+            # The bundle links its own copy of static/styles.css
+            if 'id="burcup-styles"' in body:
+                return ""
+            if body.startswith(IMAGE_MARKER):
+                path = body[len(IMAGE_MARKER):-len("-->")]
+                return f'<img src="{self.image(path)}" alt="" loading="lazy">'
+            body = STATIC_IMAGE_RE.sub(lambda m: self.image(os.path.join(DERIVED_DIR, m.group(1))), body)
+            return markdown_to_html(body)
+        if kind == "title":
+            return f"<h1>{_inline(proto.body)}</h1>"
+        if kind == "caption":
+            body = proto.body if proto.allow_html else _inline(proto.body)
+            return f'<div class="caption">{body}</div>'
+        if kind == "divider":
+            return "<hr>"
+        if kind == "flex_container" and not node.children:
+            return ""
+        if kind == "flex_container":
+            gap = GAPS.get(GapSize.Name(proto.flex_container.gap_config.gap_size), "1rem")
+            return f'<div class="row" style="gap: {gap};">\n{self.children(node)}\n</div>'
+        if kind == "column":
+            return f'<div class="col" style="flex: {proto.weight:g};">\n{self.children(node)}\n</div>'
+        if kind == "tab_container":
+            self.tab_groups += 1
+            group = f"tabs-{self.tab_groups}"
+            heads, panels = [], []
+            for i, tab in enumerate(node.children.values()):
+                checked = " checked" if i == 0 else ""
+                heads.append(f'<input type="radio" name="{group}" id="{group}-{i}"{checked}>'
+                             f'<label for="{group}-{i}">{html.escape(tab.proto.label)}</label>')
+                panels.append(f'<div class="tab-panel">\n{self.children(tab)}\n</div>')
+            return f'<div class="tabs">\n{"".join(heads)}\n{"".join(panels)}\n</div>'
+        if proto is None and hasattr(node, "children"):
+            return self.children(node)
+        self.unsupported.append(kind)
+        return f"<!-- unsupported element: {kind} -->"
+
+
+def page_html(page, content, live_url, logo):
+    links = []
+    for name, filename in PAGES.items():
+        active = ' class="active"' if name == page else ""
+        links.append(f'<a href="{filename}"{active}>{ICONS[name]} {html.escape(name)}</a>')
+    for name in LIVE_PAGES:
+        href = html.escape(f"{live_url}?page={quote(name)}")
+        links.append(f'<a href="{href}">{ICONS[name]} {html.escape(name)}</a>')
+    logo_html = f'<img src="{logo}" alt="버컵 (Burcup) | 써클리프">' if logo else "<h2>🍄 버컵 (Burcup) | 써클리프</h2>"
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(page)} | 버컵 (Burcup) - 친환경 버섯 폐배지 컵홀더 | 써클리프(CIRCLEAF)</title>
+<link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>🍄</text></svg>">
+<link rel="stylesheet" href="site.css">
+<link rel="stylesheet" href="styles.css">
+</head>
+<body>
+<aside class="sidebar">
+{logo_html}
+<hr>
+<nav>
+{chr(10).join(links)}
+</nav>
+</aside>
+<main class="main">
+{content}
+</main>
+</body>
+</html>
+"""
+
+
+# Run one menu branch of app.py headlessly and return its main-area element tree
+def run_page(page):
+    # Images become markers carrying the derivative path, so the bundle can ship the file itself
+    def export_image(image, *args, **kwargs):
+        st.markdown(f"{IMAGE_MARKER}{image}-->", unsafe_allow_html=True)
+
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page), \
+            mock.patch("streamlit.image", export_image):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        # Static SVG donut instead of the Plotly chart
+        at.query_params["lite"] = "1"
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return at._tree.children[0]
+
+
+def export(out_dir, live_url):
+    os.makedirs(out_dir, exist_ok=True)
+    renderer = Renderer(out_dir)
+    logo_path = image_path("burcup.png", 640)
+    logo = renderer.image(logo_path) if logo_path else None
+    written = []
+    for page, filename in PAGES.items():
+        content = renderer.children(run_page(page))
+        path = os.path.join(out_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page_html(page, content, live_url, logo))
+        written.append(path)
+    path = os.path.join(out_dir, "site.css")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(SITE_CSS.replace("/* tab rules */", tab_rules()))
+    written.append(path)
+    shutil.copyfile(STYLESHEET, os.path.join(out_dir, "styles.css"))
+    written.append(os.path.join(out_dir, "styles.css"))
+    written.extend(os.path.join(out_dir, name) for name in renderer.images.values())
+    return written, renderer.unsupported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render the read-only pages to a static HTML bundle")
+    parser.add_argument("--out", default=os.path.join(ROOT, "site"), help="output directory")
+    parser.add_argument("--live-url", default="/app/", help="URL of the live Streamlit app (Q&A, 파트너십)")
+    args = parser.parse_args()
+
+    written, unsupported = export(args.out, args.live_url)
+    for path in written:
+        print(os.path.relpath(path, args.out), os.path.getsize(path))
+    if unsupported:
+        print("unsupported elements skipped:", sorted(set(unsupported)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
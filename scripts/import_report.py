@@ -0,0 +1,166 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP = os.path.join(ROOT, "app.py")
+
+
+# `menu == "<page>"` (optionally `and ...`) -> page name
+def _menu_page(test):
+    if isinstance(test, ast.BoolOp) and isinstance(test.op, ast.And):
+        test = test.values[0]
+    if (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "menu"
+            and isinstance(test.ops[0], ast.Eq) and isinstance(test.comparators[0], ast.Constant)):
+        return test.comparators[0].value
+    return None
+
+
+# Modules pulled in on every rerun vs. only by a given page, read from app.py itself:
+# imports inside a `menu == ...` branch belong to that page, everything else is the base set
+def app_imports(path=APP):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    base, pages = [], {}
+
+    def visit(node, page):
+        if isinstance(node, ast.If) and (branch := _menu_page(node.test)):
+            for child in node.body:
+                visit(child, branch)
+            for child in node.orelse:
+                visit(child, page)
+            return
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else [node.module]
+            target = pages.setdefault(page, []) if page else base
+            target.extend(name for name in names if name not in target)
+        for child in ast.iter_child_nodes(node):
+            visit(child, page)
+
+    visit(tree, None)
+    return base, {"base": [], **{page: [m for m in deps if m not in base] for page, deps in pages.items()}}
+
+
+# Heavy libraries imported inside functions (on first use), by the page that triggers them.
+# The walk above only sees module-level imports, and charts is imported by every page while
+# plotly is only loaded by the equity donut. plotly.graph_objects loads its classes on first
+# attribute access, so the modules behind go.Figure / go.Pie are listed too
+LAZY = {
+    "지분 정보": ["plotly.graph_objects", "plotly.graph_objs._figure", "plotly.graph_objs._pie"],
+    "Q&A": ["langchain_openai", "langchain_core.messages", "tiktoken"],
+}
+
+
+# Third-party modules imported inside functions of the app's own modules
+def lazy_imports(root=ROOT):
+    found = set()
+    for name in sorted(os.listdir(root)):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(root, name), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for func in ast.walk(tree):
+            if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for node in ast.walk(func):
+                if isinstance(node, ast.Import):
+                    found.update(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    found.add(node.module)
+    local = {name[:-3] for name in os.listdir(root) if name.endswith(".py")}
+    return {m for m in found if m.split(".")[0] not in local | set(sys.stdlib_module_names)}
+
+
+BASE, PAGES = app_imports()
+for page, deps in LAZY.items():
+    PAGES.setdefault(page, []).extend(m for m in deps if m not in PAGES[page])
+
+
+# Cumulative import time (us) per module, plus the top-level total, in a fresh interpreter
+def measure(modules):
+    code = "".join(f"import {m}\n" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative, total = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, raw_name = line[len("import time:"):].split("|")
+        cum, name = cum.strip(), raw_name.strip()
+        if not cum.isdigit():
+            continue
+        cumulative.setdefault(name, int(cum))
+        # Nested imports are indented; only top-level lines add up without overlap
+        if len(raw_name) - len(raw_name.lstrip()) == 1:
+            total += int(cum)
+    return cumulative, total
+
+
+def run(repeat):
+    modules = BASE + [m for deps in PAGES.values() for m in deps]
+    per_module = {m: [] for m in modules}
+    per_page = {page: [] for page in PAGES}
+    for _ in range(repeat):
+        # Each module alone: its own cost including everything it drags in
+        for m in modules:
+            per_module[m].append(measure([m])[0].get(m, 0))
+        # Each page: base set plus page deps, shared imports counted once
+        for page, deps in PAGES.items():
+            per_page[page].append(measure(BASE + deps)[1])
+    median = lambda values: int(statistics.median(values))
+    return {
+        "python": sys.version.split()[0],
+        "modules_us": {m: median(v) for m, v in per_module.items()},
+        "pages_us": {p: median(v) for p, v in per_page.items()},
+    }
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for section in ("modules_us", "pages_us"):
+        for name, value in report[section].items():
+            old = baseline.get(section, {}).get(name)
+            if old and value > old * (1 + threshold):
+                regressions.append(f"{section}/{name}: {old} -> {value} us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for app.py dependencies")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before flagging (default 0.25)")
+    args = parser.parse_args()
+
+    # A new lazy import that LAZY doesn't list would go unmeasured
+    listed = {m.split(".")[0] for m in BASE + [m for deps in PAGES.values() for m in deps]}
+    for module in sorted(lazy_imports()):
+        if module.split(".")[0] not in listed:
+            print(f"WARNING lazy import {module} is not in LAZY; its page cost is not measured", file=sys.stderr)
+
+    report = run(args.repeat)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+READ_ONLY_PAGES = ["홈", "제품 소개", "비즈니스 모델", "지분 정보", "향후 계획"]
+QUESTIONS = ["버컵이 뭐예요?", "생분해 기간이 얼마나 되나요?", "단열 성능은 어떤가요?", "제조 공정을 설명해 주세요"]
+# Contact form widgets, by label
+NAME, CATEGORY, EMAIL, MESSAGE, SUBMIT = "성함 / 업체명", "문의 유형", "이메일 주소", "상세 내용", "🚀 메시지 전송하기"
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+WIDGETS = ("chat_input", "text_input", "text_area", "selectbox", "button")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(q * (len(values) - 1))))], 1)
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+# Server CPU seconds (user + system) so far
+def cpu_seconds(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except OSError:
+        return None
+
+
+# One simulated browser tab: a websocket speaking the Streamlit BackMsg/ForwardMsg protocol.
+# Widget ids (and the fragment each widget lives in) are learned from the deltas, like the frontend does.
+class Session:
+    def __init__(self, url, index, timeout):
+        self.url = url
+        self.index = index
+        self.timeout = timeout
+        self.ws = None
+        self.query = ""
+        self.widgets = {}
+        self.reruns = []
+        self.errors = []
+        self.turn = 0
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _learn(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return None
+        kind = delta.new_element.WhichOneof("type")
+        if kind == "exception":
+            return delta.new_element.exception.message
+        if kind in WIDGETS:
+            element = getattr(delta.new_element, kind)
+            key = "chat_input" if kind == "chat_input" else element.label
+            self.widgets[key] = (element.id, delta.fragment_id)
+        return None
+
+    # Send one rerun request and wait for its script_finished; latency is recorded per kind
+    async def rerun(self, kind, states=(), fragment_id=""):
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query
+        msg.rerun_script.widget_states.widgets.extend(states)
+        msg.rerun_script.fragment_id = fragment_id
+        start = time.perf_counter()
+        error = None
+        try:
+            await self.ws.send(msg.SerializeToString())
+            while True:
+                forward = ForwardMsg()
+                forward.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+                kind_ = forward.WhichOneof("type")
+                if kind_ == "delta":
+                    error = self._learn(forward.delta) or error
+                elif kind_ == "script_finished":
+                    if forward.script_finished not in FINISHED:
+                        error = error or f"script finished with status {forward.script_finished}"
+                    break
+        except (asyncio.TimeoutError, websockets.ConnectionClosed, OSError) as e:
+            error = f"{type(e).__name__}: {e}"
+        self.reruns.append((kind, (time.perf_counter() - start) * 1000))
+        if error:
+            self.errors.append((kind, error))
+        return error is None
+
+    async def open_page(self, page):
+        self.query = f"page={quote(page)}"
+        return await self.rerun("page")
+
+    async def ask(self, question):
+        widget_id, fragment_id = self.widgets["chat_input"]
+        state = WidgetState(id=widget_id)
+        state.chat_input_value.data = question
+        return await self.rerun("chat", [state], fragment_id)
+
+    async def submit_contact(self):
+        self.turn += 1
+        values = {
+            NAME: f"부하 테스트 {self.index}",
+            EMAIL: f"load{self.index}-{self.turn}@example.com",
+            MESSAGE: f"부하 테스트 문의 {self.index}-{self.turn}",
+        }
+        states = []
+        for label, value in values.items():
+            states.append(WidgetState(id=self.widgets[label][0], string_value=value))
+        states.append(WidgetState(id=self.widgets[CATEGORY][0], string_value="샘플 신청"))
+        submit_id, fragment_id = self.widgets[SUBMIT]
+        states.append(WidgetState(id=submit_id, trigger_value=True))
+        return await self.rerun("contact", states, fragment_id)
+
+
+async def think(seconds):
+    if seconds:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * seconds)
+
+
+# Scripted journeys
+async def browse(session, think_time):
+    for page in READ_ONLY_PAGES:
+        await session.open_page(page)
+        await think(think_time)
+
+
+async def chat(session, think_time):
+    if await session.open_page("Q&A") and "chat_input" in session.widgets:
+        for turn in range(3):
+            await think(think_time)
+            await session.ask(f"{QUESTIONS[(session.index + turn) % len(QUESTIONS)]} ({session.index}-{session.turn}-{turn})")
+        session.turn += 1
+
+
+async def contact(session, think_time):
+    if await session.open_page("파트너십") and SUBMIT in session.widgets:
+        await think(think_time)
+        await session.submit_contact()
+
+
+JOURNEYS = {"browse": browse, "chat": chat, "contact": contact}
+
+
+async def run_session(url, index, journeys, repeat, think_time, timeout):
+    session = Session(url, index, timeout)
+    try:
+        await session.connect()
+        for _ in range(repeat):
+            await JOURNEYS[journeys[index % len(journeys)]](session, think_time)
+    except Exception as e:
+        session.errors.append(("connect", f"{type(e).__name__}: {e}"))
+    finally:
+        await session.close()
+    return session
+
+
+async def sample_rss(pid, peaks, stop):
+    while not stop.is_set():
+        value = rss_mb(pid)
+        if value is not None:
+            peaks.append(value)
+        await asyncio.sleep(0.25)
+
+
+async def run_level(url, sessions, args, pid):
+    peaks, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, peaks, stop)) if pid else None
+    start, cpu, server_cpu = time.perf_counter(), time.process_time(), cpu_seconds(pid) if pid else None
+    done = await asyncio.gather(*(
+        run_session(url, i, args.journeys, args.repeat, args.think, args.timeout) for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    # Near 100% means this client, not the server, is the bottleneck
+    client_cpu = (time.process_time() - cpu) / elapsed
+    # ~100% (one core) while latencies climb: reruns are serialized on the GIL
+    if server_cpu is not None:
+        server_cpu = (cpu_seconds(pid) - server_cpu) / elapsed
+    stop.set()
+    if sampler:
+        await sampler
+
+    latencies = [ms for s in done for _, ms in s.reruns]
+    by_kind = {}
+    for s in done:
+        for kind, ms in s.reruns:
+            by_kind.setdefault(kind, []).append(ms)
+    session_p95 = [percentile([ms for _, ms in s.reruns], 0.95) for s in done if s.reruns]
+    errors = [e for s in done for e in s.errors]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "reruns_per_s": round(len(latencies) / elapsed, 1),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / max(1, len(latencies)), 4),
+        "p50_ms": percentile(latencies, 0.5),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "session_p95_median_ms": percentile(session_p95, 0.5),
+        "session_p95_worst_ms": max(session_p95) if session_p95 else None,
+        "by_kind": {k: {"count": len(v), "p50_ms": percentile(v, 0.5), "p95_ms": percentile(v, 0.95)} for k, v in by_kind.items()},
+        "rss_peak_mb": max(peaks) if peaks else None,
+        "rss_after_mb": rss_mb(pid) if pid else None,
+        "server_cpu_pct": round(server_cpu * 100, 1) if server_cpu is not None else None,
+        "client_cpu_pct": round(client_cpu * 100, 1),
+        "sample_errors": sorted({e for _, e in errors})[:5],
+    }
+
+
+# `streamlit run app.py` with a fake LLM, a local SMTP sink and a throwaway outbox
+def launch_server(port, workdir):
+    import smtp_sink
+    sink = smtp_sink.start()
+    env = dict(os.environ)
+    env.setdefault("LLM_BACKEND", "fake")
+    env.update({
+        "OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite3"),
+        "ANALYTICS_PATH": os.path.join(workdir, "analytics.sqlite3"),
+        "CHAT_HISTORY_PATH": os.path.join(workdir, "chat_history.sqlite3"),
+        "EMAIL_SMTP_HOST": "127.0.0.1",
+        "EMAIL_SMTP_PORT": str(sink.server_address[1]),
+        "EMAIL_SMTP_STARTTLS": "0",
+        "EMAIL_SENDER": "load@example.com",
+        "EMAIL_RECEIVER": "inbox@example.com",
+        # Every simulated visitor shares 127.0.0.1
+        "CONTACT_IP_BURST": "100000",
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+         "--server.headless", "true", "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("streamlit server did not become healthy")
+
+
+async def main_async(args, url, pid):
+    levels = []
+    for sessions in args.sessions:
+        level = await run_level(url, sessions, args, pid)
+        levels.append(level)
+        print(f"{sessions:4d} sessions  {level['reruns']:5d} reruns  {level['reruns_per_s']:6.1f}/s  "
+              f"p50 {level['p50_ms']} ms  p95 {level['p95_ms']} ms  p99 {level['p99_ms']} ms  "
+              f"worst session p95 {level['session_p95_worst_ms']} ms  errors {level['error_rate']:.1%}  "
+              f"RSS {level['rss_peak_mb']} MB  CPU server {level['server_cpu_pct']}% / client {level['client_cpu_pct']}%", flush=True)
+        for kind, row in level["by_kind"].items():
+            print(f"      {kind:<8} n={row['count']:<5} p50 {row['p50_ms']} ms  p95 {row['p95_ms']} ms")
+        for error in level["sample_errors"]:
+            print(f"      error: {error}")
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp up simulated browser sessions against app.py over the websocket")
+    parser.add_argument("--sessions", default="1,5,10,25,50", help="comma-separated concurrency levels")
+    parser.add_argument("--journeys", default="browse,chat,contact",
+                        help="journeys assigned round-robin to sessions (browse, chat, contact)")
+    parser.add_argument("--repeat", type=int, default=2, help="journeys per session per level")
+    parser.add_argument("--think", type=float, default=0.5, help="mean think time between steps (s)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds to wait for one rerun")
+    parser.add_argument("--url", help="existing app, e.g. http://host:8501 (default: launch one locally)")
+    parser.add_argument("--pid", type=int, help="server pid for RSS sampling when using --url")
+    parser.add_argument("--port", type=int, default=8599, help="port for the launched app")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    args.sessions = [int(n) for n in args.sessions.split(",")]
+    args.journeys = args.journeys.split(",")
+    unknown = set(args.journeys) - set(JOURNEYS)
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(sorted(unknown))}")
+
+    proc = None
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.url:
+            base, pid = args.url.rstrip("/"), args.pid
+        else:
+            proc = launch_server(args.port, workdir)
+            base, pid = f"http://127.0.0.1:{args.port}", proc.pid
+        url = base.replace("http", "ws", 1) + "/_stcore/stream"
+        try:
+            levels = asyncio.run(main_async(args, url, pid))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+    if args.output:
+        report = {"journeys": args.journeys, "repeat": args.repeat, "think_s": args.think, "levels": levels}
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
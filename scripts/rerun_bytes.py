@@ -0,0 +1,83 @@
+import argparse
+import atexit
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The measured runs import the app here: their page views and any chat history or
+# outbox rows go to a temp dir instead of the real databases
+STATE_DIR = tempfile.mkdtemp(prefix="rerun-bytes-")
+atexit.register(shutil.rmtree, STATE_DIR, True)
+os.environ.update({
+    "ANALYTICS_PATH": os.path.join(STATE_DIR, "analytics.sqlite3"),
+    "OUTBOX_PATH": os.path.join(STATE_DIR, "outbox.sqlite3"),
+    "CHAT_HISTORY_PATH": os.path.join(STATE_DIR, "chat_history.sqlite3"),
+})
+
+from streamlit.testing.v1 import AppTest
+
+PAGES = ["홈", "제품 소개", "비즈니스 모델", "지분 정보", "향후 계획", "Q&A", "파트너십"]
+STYLE = re.compile(r"<style[^>]*>.*?</style>|\sstyle=(\"[^\"]*\"|'[^']*')", re.S)
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+# Element protos in a rendered tree, their serialized size, and how much of it is CSS
+def tree_stats(tree):
+    elements = total = css = 0
+    for node in walk(tree):
+        proto = getattr(node, "proto", None)
+        if proto is None:
+            continue
+        elements += 1
+        total += len(proto.SerializeToString())
+        body = getattr(proto, "body", "")
+        if isinstance(body, str):
+            css += sum(len(m.group(0).encode()) for m in STYLE.finditer(body))
+    return {"elements": elements, "bytes": total, "css_bytes": css}
+
+
+# Element protos the server sends for one rerun of a page
+def measure(page):
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.run()
+    return tree_stats(at._tree)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes of element deltas pushed per rerun, per page")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="earlier JSON report to show before -> after")
+    args = parser.parse_args()
+
+    report = {page: measure(page) for page in PAGES}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    for page, row in report.items():
+        line = f"{page:>8}  {row['elements']:3d} elements  {row['bytes']:7d} B  (css {row['css_bytes']:6d} B)"
+        old = baseline.get(page)
+        if old:
+            line += f"   was {old['bytes']:7d} B (css {old['css_bytes']:6d} B)  {row['bytes'] - old['bytes']:+d} B"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import socketserver
+import threading
+import time
+
+# Minimal SMTP stand-in for local runs of the outbox worker: accepts every message
+# (and any AUTH), optionally delays or rejects, and keeps what it received in memory.
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        # Stands in for the TCP/TLS handshake and login cost of a real provider
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        self.reply("220 smtp-sink ready")
+        recipients = []
+        while line := self.rfile.readline():
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-smtp-sink")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 smtp-sink")
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[-1].strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b".\n", b""):
+                    data.append(chunk)
+                if server.delay:
+                    time.sleep(server.delay)
+                if server.fail:
+                    self.reply("451 4.3.0 Temporary failure (smtp-sink --fail)")
+                    continue
+                with server.lock:
+                    server.messages.append((recipients, b"".join(data)))
+                self.reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, delay=0.0, fail=False, connect_delay=0.0):
+        super().__init__(address, SinkHandler)
+        self.delay = delay
+        self.connect_delay = connect_delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+
+
+# Start a sink on a background thread; returns the server (port in server.server_address)
+def start(host="127.0.0.1", port=0, delay=0.0, fail=False, connect_delay=0.0):
+    server = SinkServer((host, port), delay, fail, connect_delay)
+    threading.Thread(target=server.serve_forever, name="smtp-sink", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink for testing the contact-form outbox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before accepting each message")
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="seconds to wait before greeting a connection")
+    parser.add_argument("--fail", action="store_true", help="reject every message with a 451")
+    args = parser.parse_args()
+
+    server = SinkServer((args.host, args.port), args.delay, args.fail, args.connect_delay)
+    print(f"smtp-sink listening on {args.host}:{args.port} "
+          f"(EMAIL_SMTP_HOST={args.host} EMAIL_SMTP_PORT={args.port} EMAIL_SMTP_STARTTLS=0)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"received {len(server.messages)} messages over {server.connections} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import Analytics
+
+
+# The database can't be opened: the batch goes back to the buffer instead of being lost
+def test_failed_open_keeps_events(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    analytics = Analytics(str(blocker / "analytics.sqlite3"))
+    for page in ("홈", "Q&A"):
+        analytics.page_view("s", page)
+    with pytest.raises(OSError):
+        analytics.flush()
+    assert analytics.stats()["buffered"] == 2
+    analytics.path = str(tmp_path / "analytics.sqlite3")
+    assert analytics.flush() == 2
+    assert analytics.stats()["dropped"] == 0
+
+
+# Re-queueing into a full buffer drops (and counts) the failed batch's oldest events
+def test_requeue_overflow_is_counted(tmp_path):
+    analytics = Analytics(str(tmp_path / "analytics.sqlite3"), max_buffer=5)
+    for i in range(3):
+        analytics.track("event", key=str(i))
+
+    def busy_db():
+        for i in range(3, 7):
+            analytics.track("event", key=str(i))
+        raise OSError("database is locked")
+
+    analytics._db = busy_db
+    with pytest.raises(OSError):
+        analytics.flush()
+    assert [event[3] for event in analytics._buffer] == ["2", "3", "4", "5", "6"]
+    assert analytics.stats()["dropped"] == 2
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the app's analytics, outbox and chat history out of the working tree
+_tmp = tempfile.mkdtemp(prefix="fragments-test-")
+for name, filename in (("ANALYTICS_PATH", "analytics.sqlite3"), ("OUTBOX_PATH", "outbox.sqlite3"),
+                       ("CHAT_HISTORY_PATH", "chat_history.sqlite3")):
+    os.environ[name] = os.path.join(_tmp, filename)
+
+from streamlit.testing.v1 import AppTest
+
+import fragments
+from content import business_store
+
+PAGES = ["홈", "제품 소개", "비즈니스 모델", "지분 정보", "향후 계획", "Q&A", "파트너십"]
+FRAGMENTS = [name for name, value in vars(fragments).items() if hasattr(value, "uncached")]
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+# Serialized element protos of one run of a page
+def render(page, uncached=False):
+    patches = {name: getattr(fragments, name).uncached for name in FRAGMENTS} if uncached else {}
+    with mock.patch("streamlit_option_menu.option_menu", lambda *a, **k: page), \
+            mock.patch.dict(vars(fragments), patches):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.run()
+    assert not at.exception, at.exception[0].message
+    protos = [getattr(node, "proto", None) for node in walk(at._tree)]
+    return [proto.SerializeToString() for proto in protos if proto is not None]
+
+
+def test_cached_matches_uncached():
+    snapshot = business_store.get()
+    for name in FRAGMENTS:
+        fragment = getattr(fragments, name)
+        assert fragment(snapshot) == fragment.uncached(snapshot), name
+        # Second call is a cache hit
+        assert fragment(snapshot) == fragment.uncached(snapshot), name
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_page_renders_same_without_cache(page):
+    expected = render(page, uncached=True)
+    assert render(page) == expected
+    # Warm cache: the markup now comes from the previous run
+    assert render(page) == expected
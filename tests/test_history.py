@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import HistoryStore
+
+
+def fill(history, count):
+    for i in range(count):
+        history.append("human", f"질문 {i} " * 5)
+        history.append("ai", f"답변 {i} " * 10)
+
+
+# Turns spilled long ago stay as long as the session itself is active
+def test_retention_follows_session_activity(tmp_path):
+    store = HistoryStore(path=str(tmp_path / "h.sqlite3"), max_bytes=200, retention_hours=1)
+    active, gone = store.get("active"), store.get("gone")
+    fill(active, 10)
+    fill(gone, 10)
+    db = store._db()
+    db.execute("UPDATE turns SET saved = saved - 7200")
+    db.execute("UPDATE sessions SET last_seen = last_seen - 7200")
+    gone.last_used -= 7200
+    store.sweep()
+    assert [t.content for t in active[0:2]] == ["질문 0 " * 5, "답변 0 " * 10]
+    assert len(gone) == 0
+    assert db.execute("SELECT COUNT(*) FROM turns WHERE session = 'gone'").fetchone()[0] == 0
+
+
+def test_sweep_and_append_keep_every_turn(tmp_path):
+    store = HistoryStore(path=str(tmp_path / "h.sqlite3"), max_bytes=200, idle_minutes=0)
+    history = store.get("s")
+    done = threading.Event()
+
+    def janitor():
+        while not done.is_set():
+            store.sweep()
+
+    thread = threading.Thread(target=janitor)
+    thread.start()
+    try:
+        fill(history, 50)
+    finally:
+        done.set()
+        thread.join()
+    turns = history[0:len(history)]
+    assert len(turns) == 100
+    assert [t.content for t in turns[-2:]] == ["질문 49 " * 5, "답변 49 " * 10]
+    assert all(t.content.startswith("질문" if i % 2 == 0 else "답변") for i, t in enumerate(turns))
+
+
+# A sweep that fails halfway must not leave the shared connection inside its transaction
+def test_failed_sweep_rolls_back(tmp_path):
+    store = HistoryStore(path=str(tmp_path / "h.sqlite3"), max_bytes=200)
+    history = store.get("s")
+    fill(history, 5)
+    db = store._db()
+    db.execute("ALTER TABLE sessions RENAME TO sessions_old")
+    try:
+        store.sweep()
+    except Exception:
+        pass
+    else:
+        raise AssertionError("sweep should fail without the sessions table")
+    assert not db.in_transaction
+    db.execute("ALTER TABLE sessions_old RENAME TO sessions")
+    fill(history, 5)
+    store.sweep()
+    assert len(history) == 20
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intents
+from content import business_store
+
+
+# Questions that share a word with an intent but ask something else go to the LLM
+@pytest.mark.parametrize("question", [
+    "주식회사 써클리프는 무슨 회사예요?",
+    "사업자등록번호 알려줘",
+    "컵홀더 주문했는데 배송 조회 번호로 알려줘",
+    "배송 주소 변경하고 싶어요",
+    "썩은 버섯을 쓰나요?",
+])
+def test_not_answered_locally(question):
+    assert intents.answer(question, business_store.get()) is None
+
+
+@pytest.mark.parametrize("question, intent", [
+    # The request's examples
+    ("대표번호가 뭐야?", "contact"),
+    ("지분 구조 알려줘", "equity"),
+    ("공장 위치", "location"),
+    ("생분해 기간", "biodegradation"),
+    ("주주가 몇 명이에요?", "equity"),
+    ("연락처 알려줘", "contact"),
+    ("대표번호가 어떻게 되나요?", "contact"),
+    ("이메일 주소 알려주세요", "contact"),
+    ("본사 위치가 어디예요?", "location"),
+    ("회사 주소 알려줘", "location"),
+    ("주주 구성이 어떻게 되나요?", "equity"),
+    ("생분해 기간이 얼마나 되나요?", "biodegradation"),
+    ("버컵은 얼마나 걸려서 썩나요?", "biodegradation"),
+])
+def test_answered_locally(question, intent):
+    name, _, confidence = intents.match(question)
+    assert name == intent and confidence >= intents.MIN_CONFIDENCE
+    assert intents.answer(question, business_store.get())
+
+
+def test_reasoning_goes_to_llm():
+    assert intents.answer("왜 지분이 그렇게 나뉘었나요?", business_store.get()) is None
+
+
+# Cache hits have their own bucket, not counted as fast-path misses
+def test_stats_by_answer_source():
+    before = intents.stats()
+    for source in ("fast_path", "cache", "cache", "llm", "error"):
+        intents.record(source)
+    after = intents.stats()
+    assert [after[k] - before[k] for k in ("local", "cache", "llm")] == [1, 2, 2]
@@ -0,0 +1,47 @@
+import hashlib
+import os
+import re
+import threading
+
+import streamlit as st
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLESHEET = os.path.join(BASE_DIR, "static", "styles.css")
+# Where server.enableStaticServing exposes static/ (relative to the app URL)
+STYLESHEET_URL = "app/static/styles.css"
+
+_lock = threading.Lock()
+_cache = {}
+
+
+# Inline fallback: drop comments and collapse whitespace
+def _minify(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+
+
+# (minified css, short content hash), re-read only when the file changes
+def stylesheet():
+    stat = os.stat(STYLESHEET)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get("css")
+    if cached is None or cached[0] != key:
+        with open(STYLESHEET, encoding="utf-8") as f:
+            css = f.read()
+        cached = (key, _minify(css), hashlib.sha256(css.encode()).hexdigest()[:12])
+        with _lock:
+            _cache["css"] = cached
+    return cached[1], cached[2]
+
+
+# A hash-versioned <link> when static serving is on (the browser fetches and caches the
+# file once), otherwise the stylesheet inline
+def stylesheet_tag():
+    css, digest = stylesheet()
+    if st.get_option("server.enableStaticServing"):
+        return f'<link rel="stylesheet" id="burcup-styles" href="{STYLESHEET_URL}?v={digest}">'
+    return f'<style id="burcup-styles">{css}</style>'
+
+
+def inject():
+    st.markdown(stylesheet_tag(), unsafe_allow_html=True)